@@ -6,18 +6,67 @@ verification framework. Tests are derived from the payment_handler.vsp
 contracts and use Hypothesis for input generation.
 """
 
-from decimal import Decimal
+import asyncio
+import json
+import string
+from decimal import ROUND_DOWN, Decimal
 from typing import Any
 
 import pytest
 
 # Hypothesis may not be installed, make it optional
 try:
-    from hypothesis import given, settings, strategies as st
+    from hypothesis import HealthCheck, given, settings, strategies as st, target
     HYPOTHESIS_AVAILABLE = True
 except ImportError:
     HYPOTHESIS_AVAILABLE = False
 
+# Precondition bounds, compared as Decimals so sub-cent digits count
+_ZERO = Decimal("0")
+_MAX_AMOUNT = Decimal("50000")
+_WHOLE_CENTS = Decimal("1")
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Convert a Decimal amount to integer cents, truncating sub-cent digits."""
+    return int((amount * 100).quantize(_WHOLE_CENTS, rounding=ROUND_DOWN))
+
+
+def _validation_error(message: str) -> dict[str, Any]:
+    """Build a precondition failure response."""
+    return {"success": False, "error_code": "validation_failed", "message": message}
+
+
+_ERR_AMOUNT_NOT_POSITIVE = "Amount must be positive"
+_ERR_AMOUNT_EXCEEDS_MAX = "Amount exceeds maximum"
+_ERR_ORDER_ID_REQUIRED = "Order ID is required"
+_ERR_USER_ID_REQUIRED = "User ID is required"
+
+# Shared test amounts
+_AMOUNT_TEN = Decimal("10.00")
+_AMOUNT_NEGATIVE = Decimal("-10.00")
+_AMOUNT_OVER_MAX = Decimal("100000.00")
+
+if HYPOTHESIS_AVAILABLE:
+    _MIN_AMOUNT = Decimal("0.01")
+    _AMOUNTS_UP_TO_MAX = st.decimals(
+        min_value=_MIN_AMOUNT, max_value=_MAX_AMOUNT, places=2
+    )
+    _AMOUNTS_UP_TO_10K = st.decimals(
+        min_value=_MIN_AMOUNT, max_value=Decimal("10000"), places=2
+    )
+    _AMOUNTS_UP_TO_1K = st.decimals(
+        min_value=_MIN_AMOUNT, max_value=Decimal("1000"), places=2
+    )
+    _USER_IDS = st.text(
+        min_size=1,
+        max_size=100,
+        alphabet=string.ascii_lowercase + string.digits + "_",
+    )
+    _LOWERCASE_USER_IDS = st.text(
+        min_size=1, max_size=50, alphabet=string.ascii_lowercase
+    )
+
 # Mock implementations for testing
 
 
@@ -25,7 +74,8 @@ class MockDatabase:
     """Mock database for testing."""
 
     def __init__(self):
-        self._transactions: dict[str, dict] = {}
+        # transaction_id -> (order_id, user_id, amount, status)
+        self._transactions: dict[str, tuple[str, str, Decimal, str]] = {}
         self._idempotency_keys: dict[str, str] = {}
 
     def check_idempotency(self, key: str) -> str | None:
@@ -42,12 +92,7 @@ class MockDatabase:
         idempotency_key: str | None = None,
     ) -> None:
         """Record a transaction."""
-        self._transactions[transaction_id] = {
-            "order_id": order_id,
-            "user_id": user_id,
-            "amount": amount,
-            "status": status,
-        }
+        self._transactions[transaction_id] = (order_id, user_id, amount, status)
         if idempotency_key:
             self._idempotency_keys[idempotency_key] = transaction_id
 
@@ -55,6 +100,11 @@ class MockDatabase:
         """Check if a transaction was recorded."""
         return transaction_id in self._transactions
 
+    def reset(self) -> None:
+        """Clear all recorded transactions and idempotency keys."""
+        self._transactions.clear()
+        self._idempotency_keys.clear()
+
 
 class MockStripe:
     """Mock Stripe API for testing."""
@@ -67,7 +117,11 @@ class MockStripe:
             fail_pattern: Optional pattern to trigger failures
         """
         self.fail_pattern = fail_pattern
-        self._charges: list[dict] = []
+        # Resolve the failure check once instead of testing fail_pattern per call
+        if fail_pattern:
+            self._should_fail = lambda user_id: fail_pattern in user_id
+        else:
+            self._should_fail = lambda user_id: False
 
     def create_charge(
         self,
@@ -76,15 +130,10 @@ class MockStripe:
         idempotency_key: str | None = None,
     ) -> dict:
         """Create a charge."""
-        if self.fail_pattern and self.fail_pattern in user_id:
+        if self._should_fail(user_id):
             raise RuntimeError("Payment failed")
 
-        charge_id = f"ch_{user_id}_{int(amount * 100)}"
-        self._charges.append({
-            "id": charge_id,
-            "amount": amount,
-            "user_id": user_id,
-        })
+        charge_id = "ch_" + user_id + "_" + str(_to_cents(amount))
         return {"id": charge_id, "status": "succeeded"}
 
 
@@ -110,33 +159,17 @@ def payment_handler_v1(
     - Postcondition: transaction.recorded OR error.logged
     """
     # Validate preconditions
-    if amount <= 0:
-        return {
-            "success": False,
-            "error_code": "validation_failed",
-            "message": "Amount must be positive",
-        }
+    if amount <= _ZERO:
+        return _validation_error(_ERR_AMOUNT_NOT_POSITIVE)
 
-    if amount > Decimal("50000"):
-        return {
-            "success": False,
-            "error_code": "validation_failed",
-            "message": "Amount exceeds maximum",
-        }
+    if amount > _MAX_AMOUNT:
+        return _validation_error(_ERR_AMOUNT_EXCEEDS_MAX)
 
     if not order_id:
-        return {
-            "success": False,
-            "error_code": "validation_failed",
-            "message": "Order ID is required",
-        }
+        return _validation_error(_ERR_ORDER_ID_REQUIRED)
 
     if not user_id:
-        return {
-            "success": False,
-            "error_code": "validation_failed",
-            "message": "User ID is required",
-        }
+        return _validation_error(_ERR_USER_ID_REQUIRED)
 
     # Check idempotency
     if idempotency_key:
@@ -153,7 +186,7 @@ def payment_handler_v1(
     # Process payment
     try:
         charge = stripe.create_charge(amount, user_id, idempotency_key)
-        transaction_id = f"txn_{order_id}_{charge['id']}"
+        transaction_id = "txn_" + order_id + "_" + charge["id"]
 
         # Record transaction
         db.record_transaction(
@@ -180,85 +213,96 @@ def payment_handler_v1(
         }
 
 
-class TestPaymentHandlerContracts:
-    """Test payment handler contracts."""
-
-    def test_precondition_amount_positive(self):
-        """Amount must be positive."""
-        db = MockDatabase()
-        stripe = MockStripe()
-
-        result = payment_handler_v1(
-            order_id="ord_test123456789012",
-            amount=Decimal("-10.00"),
-            user_id="user_123",
-            idempotency_key=None,
-            db=db,
-            stripe=stripe,
-        )
+@pytest.fixture
+def db() -> MockDatabase:
+    """Fresh mock database for each test."""
+    return MockDatabase()
 
-        assert not result["success"]
-        assert result["error_code"] == "validation_failed"
 
-    def test_precondition_amount_max(self):
-        """Amount must not exceed maximum."""
-        db = MockDatabase()
-        stripe = MockStripe()
+@pytest.fixture
+def stripe() -> MockStripe:
+    """Fresh mock Stripe client for each test."""
+    return MockStripe()
 
-        result = payment_handler_v1(
-            order_id="ord_test123456789012",
-            amount=Decimal("100000.00"),
-            user_id="user_123",
-            idempotency_key=None,
-            db=db,
-            stripe=stripe,
-        )
 
-        assert not result["success"]
-        assert result["error_code"] == "validation_failed"
+class TestPaymentHandlerContracts:
+    """Test payment handler contracts."""
 
-    def test_precondition_order_id_required(self):
-        """Order ID is required."""
-        db = MockDatabase()
-        stripe = MockStripe()
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("amount", _AMOUNT_NEGATIVE),
+            ("amount", _AMOUNT_OVER_MAX),
+            ("amount", Decimal("50000.009")),
+            ("order_id", ""),
+            ("user_id", ""),
+        ],
+        ids=[
+            "amount_positive",
+            "amount_max",
+            "amount_max_sub_cent",
+            "order_id_required",
+            "user_id_required",
+        ],
+    )
+    def test_precondition_rejects(self, field, value, db, stripe):
+        """Inputs violating a precondition fail validation."""
+        kwargs = {
+            "order_id": "ord_test123456789012",
+            "amount": _AMOUNT_TEN,
+            "user_id": "user_123",
+            "idempotency_key": None,
+            "db": db,
+            "stripe": stripe,
+        }
+        kwargs[field] = value
 
-        result = payment_handler_v1(
-            order_id="",
-            amount=Decimal("10.00"),
-            user_id="user_123",
-            idempotency_key=None,
-            db=db,
-            stripe=stripe,
-        )
+        result = payment_handler_v1(**kwargs)
 
         assert not result["success"]
         assert result["error_code"] == "validation_failed"
 
-    def test_precondition_user_id_required(self):
-        """User ID is required."""
-        db = MockDatabase()
-        stripe = MockStripe()
-
+    def test_responses_are_fresh_json_dicts(self, db, stripe):
+        """Every response is a new plain dict that JSON can encode."""
+        kwargs = {
+            "order_id": "ord_test123456789012",
+            "amount": _AMOUNT_TEN,
+            "user_id": "user_123",
+            "idempotency_key": "idem_json",
+            "db": db,
+            "stripe": stripe,
+        }
+        responses = [
+            payment_handler_v1(**kwargs),
+            payment_handler_v1(**kwargs),
+            payment_handler_v1(**(kwargs | {"user_id": ""})),
+            payment_handler_v1(**(kwargs | {"user_id": ""})),
+        ]
+
+        for response in responses:
+            assert type(response) is dict
+            json.dumps(response)
+        assert responses[2] == responses[3]
+        assert responses[2] is not responses[3]
+
+    def test_sub_cent_positive_amount_accepted(self, db, stripe):
+        """A positive amount below one cent satisfies amount > 0."""
         result = payment_handler_v1(
             order_id="ord_test123456789012",
-            amount=Decimal("10.00"),
-            user_id="",
+            amount=Decimal("0.001"),
+            user_id="user_123",
             idempotency_key=None,
             db=db,
             stripe=stripe,
         )
 
-        assert not result["success"]
-        assert result["error_code"] == "validation_failed"
+        assert result["success"]
 
-    def test_postcondition_transaction_recorded(self):
+    def test_postcondition_transaction_recorded(self, db, stripe):
         """Successful payment records transaction."""
-        db = MockDatabase()
-        stripe = MockStripe()
-
         result = payment_handler_v1(
             order_id="ord_test123456789012",
-            amount=Decimal("10.00"),
+            amount=_AMOUNT_TEN,
             user_id="user_123",
             idempotency_key=None,
             db=db,
@@ -268,16 +312,13 @@ class TestPaymentHandlerContracts:
         assert result["success"]
         assert db.transaction_recorded(result["transaction_id"])
 
-    def test_idempotency_returns_same_result(self):
+    def test_idempotency_returns_same_result(self, db, stripe):
         """Same idempotency key returns same result."""
-        db = MockDatabase()
-        stripe = MockStripe()
-
         idempotency_key = "idem_123"
 
         result1 = payment_handler_v1(
             order_id="ord_test123456789012",
-            amount=Decimal("10.00"),
+            amount=_AMOUNT_TEN,
             user_id="user_123",
             idempotency_key=idempotency_key,
             db=db,
@@ -286,7 +327,7 @@ class TestPaymentHandlerContracts:
 
         result2 = payment_handler_v1(
             order_id="ord_test123456789012",
-            amount=Decimal("10.00"),
+            amount=_AMOUNT_TEN,
             user_id="user_123",
             idempotency_key=idempotency_key,
             db=db,
@@ -303,18 +344,19 @@ class TestPaymentHandlerProperties:
     """Property-based tests for payment handler."""
 
     @given(
-        amount=st.decimals(
-            min_value=Decimal("0.01"),
-            max_value=Decimal("50000"),
-            places=2,
-        ),
-        user_id=st.text(min_size=1, max_size=100, alphabet="abcdefghijklmnopqrstuvwxyz0123456789_"),
+        amount=_AMOUNTS_UP_TO_MAX,
+        user_id=_USER_IDS,
+    )
+    @settings(
+        max_examples=50,
+        deadline=None,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
     )
-    @settings(max_examples=100)
-    def test_valid_inputs_succeed_or_fail_gracefully(self, amount, user_id):
+    def test_valid_inputs_succeed_or_fail_gracefully(self, amount, user_id, db, stripe):
         """Valid inputs always result in success or graceful failure."""
-        db = MockDatabase()
-        stripe = MockStripe()
+        db.reset()
+        # Steer generation towards the full amount range, including the maximum
+        target(float(amount), label="amount")
 
         result = payment_handler_v1(
             order_id="ord_test123456789012",
@@ -338,38 +380,29 @@ class TestPaymentHandlerProperties:
             assert "error_code" in result
 
     @given(
-        amount=st.decimals(
-            min_value=Decimal("0.01"),
-            max_value=Decimal("10000"),
-            places=2,
-        ),
-        user_id=st.text(min_size=1, max_size=50, alphabet="abcdefghijklmnopqrstuvwxyz"),
+        amount=_AMOUNTS_UP_TO_10K,
+        user_id=_LOWERCASE_USER_IDS,
     )
-    @settings(max_examples=100)
-    def test_idempotency_property(self, amount, user_id):
+    @settings(
+        max_examples=50,
+        deadline=None,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
+    )
+    def test_idempotency_property(self, amount, user_id, db, stripe):
         """Same request with same idempotency key returns same result."""
-        db = MockDatabase()
-        stripe = MockStripe()
-
-        idempotency_key = f"test_key_{user_id}_{amount}"
+        db.reset()
 
-        result1 = payment_handler_v1(
-            order_id="ord_test123456789012",
-            amount=amount,
-            user_id=user_id,
-            idempotency_key=idempotency_key,
-            db=db,
-            stripe=stripe,
-        )
+        kwargs = {
+            "order_id": "ord_test123456789012",
+            "amount": amount,
+            "user_id": user_id,
+            "idempotency_key": "test_key_" + user_id + "_" + str(amount),
+            "db": db,
+            "stripe": stripe,
+        }
 
-        result2 = payment_handler_v1(
-            order_id="ord_test123456789012",
-            amount=amount,
-            user_id=user_id,
-            idempotency_key=idempotency_key,
-            db=db,
-            stripe=stripe,
-        )
+        result1 = payment_handler_v1(**kwargs)
+        result2 = payment_handler_v1(**kwargs)
 
         # Both results should indicate success or failure consistently
         assert result1["success"] == result2["success"]
@@ -379,17 +412,16 @@ class TestPaymentHandlerProperties:
             assert result1["transaction_id"] == result2["transaction_id"]
 
     @given(
-        amount=st.decimals(
-            min_value=Decimal("0.01"),
-            max_value=Decimal("10000"),
-            places=2,
-        ),
+        amount=_AMOUNTS_UP_TO_10K,
     )
-    @settings(max_examples=50)
-    def test_successful_payment_records_transaction(self, amount):
+    @settings(
+        max_examples=50,
+        deadline=None,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
+    )
+    def test_successful_payment_records_transaction(self, amount, db, stripe):
         """Every successful payment is recorded in the database."""
-        db = MockDatabase()
-        stripe = MockStripe()
+        db.reset()
 
         result = payment_handler_v1(
             order_id="ord_test123456789012",
@@ -405,25 +437,20 @@ class TestPaymentHandlerProperties:
             assert db.transaction_recorded(result["transaction_id"])
 
     @given(
-        amount1=st.decimals(
-            min_value=Decimal("0.01"),
-            max_value=Decimal("1000"),
-            places=2,
-        ),
-        amount2=st.decimals(
-            min_value=Decimal("0.01"),
-            max_value=Decimal("1000"),
-            places=2,
-        ),
+        amount1=_AMOUNTS_UP_TO_1K,
+        amount2=_AMOUNTS_UP_TO_1K,
+    )
+    @settings(
+        max_examples=50,
+        deadline=None,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
     )
-    @settings(max_examples=50)
-    def test_different_amounts_different_transactions(self, amount1, amount2):
+    def test_different_amounts_different_transactions(self, amount1, amount2, db, stripe):
         """Different amounts with different idempotency keys create different transactions."""
         if amount1 == amount2:
             return  # Skip if amounts are the same
 
-        db = MockDatabase()
-        stripe = MockStripe()
+        db.reset()
 
         result1 = payment_handler_v1(
             order_id="ord_test123456789012",
@@ -493,19 +520,21 @@ class TestPaymentHandlerDifferentialVerification:
             comparator=comparator,
         )
 
-        # Run 100 test cases
-        divergences = 0
-        for i in range(100):
-            result = await orchestrator.execute_dual(
-                "payment",
-                {
-                    "order_id": f"ord_test{i:016d}",
-                    "amount": (i + 1) * 10.0,
-                    "user_id": f"user_{i}",
-                },
+        # Build the 100 test inputs up front, then run them concurrently
+        order_ids = [f"ord_test{i:016d}" for i in range(100)]
+        user_ids = [f"user_{i}" for i in range(100)]
+        amounts = [(i + 1) * 10.0 for i in range(100)]
+
+        results = await asyncio.gather(
+            *(
+                orchestrator.execute_dual(
+                    "payment",
+                    {"order_id": order_id, "amount": amount, "user_id": user_id},
+                )
+                for order_id, amount, user_id in zip(order_ids, amounts, user_ids)
             )
-            if result.diverged:
-                divergences += 1
+        )
+        divergences = sum(1 for result in results if result.diverged)
 
         assert divergences == 0
         assert tracker.get_confidence("payment") > 0.90  # Wilson score with 100 samples
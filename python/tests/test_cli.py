@@ -2,26 +2,29 @@
 Tests for the Vesper CLI commands.
 """
 
+import pytest
 from click.testing import CliRunner
 from vesper.cli.main import main
 
 
+@pytest.fixture(scope="session")
+def runner():
+    """CLI runner shared across all command tests."""
+    return CliRunner()
+
+
 class TestCLI:
     """Test CLI commands."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_version(self):
+    def test_version(self, runner):
         """Test version command."""
-        result = self.runner.invoke(main, ["--version"])
+        result = runner.invoke(main, ["--version"])
         assert result.exit_code == 0
         assert "0.1.0" in result.output
 
-    def test_help(self):
+    def test_help(self, runner):
         """Test help command."""
-        result = self.runner.invoke(main, ["--help"])
+        result = runner.invoke(main, ["--help"])
         assert result.exit_code == 0
         assert "Vesper" in result.output
 
@@ -29,49 +32,35 @@ class TestCLI:
 class TestCompileCommand:
     """Test the compile command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_compile_example_file(self):
+    def test_compile_example_file(self, runner):
         """Test compiling an actual example file."""
-        result = self.runner.invoke(
+        result = runner.invoke(
             main, ["compile", "examples/hello_world/hello_world.vsp", "--validate-only"]
         )
         # Should at least parse and validate
         assert "Parsing" in result.output or "Error" in result.output
 
-    def test_compile_nonexistent_file(self):
+    def test_compile_nonexistent_file(self, runner):
         """Test compiling a non-existent file."""
-        result = self.runner.invoke(main, ["compile", "/nonexistent/file.vsp"])
+        result = runner.invoke(main, ["compile", "/nonexistent/file.vsp"])
         assert result.exit_code != 0
 
 
 class TestRunCommand:
     """Test the run command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_run_nonexistent_file(self):
+    def test_run_nonexistent_file(self, runner):
         """Test running a non-existent file."""
-        result = self.runner.invoke(main, ["run", "/nonexistent/file.vsp"])
+        result = runner.invoke(main, ["run", "/nonexistent/file.vsp"])
         assert result.exit_code != 0
 
 
 class TestShowCommand:
     """Test the show command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_show_example_file(self):
+    def test_show_example_file(self, runner):
         """Test showing an example node."""
-        result = self.runner.invoke(
-            main, ["show", "examples/hello_world/hello_world.vsp"]
-        )
+        result = runner.invoke(main, ["show", "examples/hello_world/hello_world.vsp"])
         # Should at least attempt to show the node
         assert "hello_world" in result.output or "Error" in result.output
 
@@ -79,13 +68,9 @@ class TestShowCommand:
 class TestCodegenCommand:
     """Test the codegen command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_codegen_example_file(self):
+    def test_codegen_example_file(self, runner):
         """Test showing generated code for example."""
-        result = self.runner.invoke(
+        result = runner.invoke(
             main, ["codegen", "examples/hello_world/hello_world.vsp"]
         )
         # Should generate or show error
@@ -95,13 +80,9 @@ class TestCodegenCommand:
 class TestVerifyCommand:
     """Test the verify command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_verify_node(self):
+    def test_verify_node(self, runner):
         """Test verifying a node."""
-        result = self.runner.invoke(main, ["verify", "test_node"])
+        result = runner.invoke(main, ["verify", "test_node"])
         # This command shows usage examples
         assert "Example usage" in result.output or "Differential" in result.output
 
@@ -109,13 +90,9 @@ class TestVerifyCommand:
 class TestConfidenceCommand:
     """Test the confidence command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_confidence_node(self):
+    def test_confidence_node(self, runner):
         """Test showing confidence for a node."""
-        result = self.runner.invoke(main, ["confidence", "test_node"])
+        result = runner.invoke(main, ["confidence", "test_node"])
         # Will show metrics or error
         assert "Confidence" in result.output or "Error" in result.output
 
@@ -123,24 +100,20 @@ class TestConfidenceCommand:
 class TestStatusCommand:
     """Test the status command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_status_text(self):
+    def test_status_text(self, runner):
         """Test status command with text format."""
-        result = self.runner.invoke(main, ["status"])
+        result = runner.invoke(main, ["status"])
         assert result.exit_code == 0
         assert "Verification Status" in result.output
 
-    def test_status_json(self):
+    def test_status_json(self, runner):
         """Test status command with JSON format."""
-        result = self.runner.invoke(main, ["status", "--format", "json"])
+        result = runner.invoke(main, ["status", "--format", "json"])
         assert result.exit_code == 0
 
-    def test_status_prometheus(self):
+    def test_status_prometheus(self, runner):
         """Test status command with Prometheus format."""
-        result = self.runner.invoke(main, ["status", "--format", "prometheus"])
+        result = runner.invoke(main, ["status", "--format", "prometheus"])
         assert result.exit_code == 0
         assert "vesper_" in result.output
 
@@ -148,13 +121,9 @@ class TestStatusCommand:
 class TestMetricsCommand:
     """Test the metrics command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_metrics_node(self):
+    def test_metrics_node(self, runner):
         """Test showing metrics for a node."""
-        result = self.runner.invoke(main, ["metrics", "test_node"])
+        result = runner.invoke(main, ["metrics", "test_node"])
         # Will show metrics or error
         assert "Metrics" in result.output or "Error" in result.output
 
@@ -162,14 +131,8 @@ class TestMetricsCommand:
 class TestTestCommand:
     """Test the test command."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_test_example_file(self):
+    def test_test_example_file(self, runner):
         """Test running test cases on example."""
-        result = self.runner.invoke(
-            main, ["test", "examples/hello_world/hello_world.vsp"]
-        )
+        result = runner.invoke(main, ["test", "examples/hello_world/hello_world.vsp"])
         # Will attempt to run tests
         assert "test" in result.output.lower() or "Error" in result.output
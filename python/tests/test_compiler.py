@@ -2,18 +2,28 @@
 Tests for the Vesper Compiler
 """
 
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+import yaml
 from vesper.compiler import VesperCompiler
-from vesper.models import NodeType
+from vesper.models import NodeType, VesperNode
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[2] / "examples"
+
+
+@pytest.fixture(scope="module")
+def compiler() -> VesperCompiler:
+    """Compiler shared by all tests in this module."""
+    return VesperCompiler()
 
 
 class TestVesperCompiler:
     """Tests for the VesperCompiler class."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-
-    def test_parse_simple_node(self) -> None:
+    def test_parse_simple_node(self, compiler: VesperCompiler) -> None:
         """Test parsing a simple Vesper node."""
         yaml_content = """
 node_id: test_node_v1
@@ -34,14 +44,14 @@ flow:
     template: "Hello, {name}!"
     output: message
 """
-        node = self.compiler.parse(yaml_content)
+        node = compiler.parse(yaml_content)
 
         assert node.node_id == "test_node_v1"
         assert node.type == NodeType.FUNCTION
         assert node.intent == "test_function"
         assert "name" in node.inputs
 
-    def test_parse_with_contracts(self) -> None:
+    def test_parse_with_contracts(self, compiler: VesperCompiler) -> None:
         """Test parsing a node with contracts."""
         yaml_content = """
 node_id: contract_node_v1
@@ -68,13 +78,73 @@ flow:
     expression: "amount * 2"
     output: doubled
 """
-        node = self.compiler.parse(yaml_content)
+        node = compiler.parse(yaml_content)
 
         assert len(node.contracts.preconditions) == 1
         assert "amount > 0" in node.contracts.preconditions
         assert len(node.contracts.postconditions) == 1
 
-    def test_validate_valid_node(self) -> None:
+    def test_parse_returns_independent_copies(self, compiler: VesperCompiler) -> None:
+        """Repeated parses of the same spec do not share mutable state."""
+        source = (EXAMPLES_DIR / "hello_world" / "hello_world.vsp").read_text()
+        first = compiler.parse(source)
+        second = compiler.parse(source)
+
+        assert first == second
+        assert first is not second
+
+        first.inputs.clear()
+        assert "name" in compiler.parse(source).inputs
+
+    def test_parse_cache_is_per_instance_and_bounded(self) -> None:
+        """Each compiler keeps its own bounded cache, which can be cleared."""
+        hello = (EXAMPLES_DIR / "hello_world" / "hello_world.vsp").read_text()
+        payment = (EXAMPLES_DIR / "payment_handler" / "payment_handler.vsp").read_text()
+        compiler = VesperCompiler(parse_cache_size=1)
+        other = VesperCompiler()
+
+        compiler.parse(hello)
+        assert list(compiler._parse_cache) == [hello]
+        assert not other._parse_cache
+
+        compiler.parse(payment)
+        assert list(compiler._parse_cache) == [payment]
+
+        compiler.cache_clear()
+        assert not compiler._parse_cache
+
+        uncached = VesperCompiler(parse_cache_size=0)
+        assert uncached.parse(hello) == compiler.parse(hello)
+        assert not uncached._parse_cache
+
+    def test_cached_parse_is_cheaper_than_reparse(self) -> None:
+        """Benchmark: copying a cached spec beats parsing it again."""
+        source = (EXAMPLES_DIR / "payment_handler" / "payment_handler.vsp").read_text()
+        cached = VesperCompiler()
+        uncached = VesperCompiler(parse_cache_size=0)
+        cached.parse(source)
+
+        def best_of(parse: Callable[[str], VesperNode]) -> float:
+            return min(timeit.repeat(lambda: parse(source), number=5, repeat=5))
+
+        # A deep copy measures well under a tenth of a parse; the factor of
+        # two leaves room for noisy machines
+        assert best_of(cached.parse) * 2 < best_of(uncached.parse)
+
+    def test_parse_dict_matches_parse(self, compiler: VesperCompiler) -> None:
+        """parse_dict builds the same node as parsing the YAML text."""
+        source = (EXAMPLES_DIR / "hello_world" / "hello_world.vsp").read_text()
+        spec = yaml.safe_load(source)
+        spec["inputs"]["name"] = "string"
+        snapshot = repr(spec)
+
+        node = compiler.parse_dict(spec)
+
+        assert node == compiler.parse(yaml.safe_dump(spec))
+        assert node.inputs["name"].type == "string"
+        assert repr(spec) == snapshot
+
+    def test_validate_valid_node(self, compiler: VesperCompiler) -> None:
         """Test validation of a valid node."""
         yaml_content = """
 node_id: valid_node_v1
@@ -95,13 +165,13 @@ flow:
     expression: "x + 1"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        result = self.compiler.validate(node)
+        node = compiler.parse(yaml_content)
+        result = compiler.validate(node)
 
         assert result.valid
         assert len(result.errors) == 0
 
-    def test_validate_invalid_node_id(self) -> None:
+    def test_validate_invalid_node_id(self, compiler: VesperCompiler) -> None:
         """Test validation rejects invalid node_id format."""
         yaml_content = """
 node_id: InvalidNodeId
@@ -120,13 +190,13 @@ flow:
   - step: noop
     operation: return
 """
-        node = self.compiler.parse(yaml_content)
-        result = self.compiler.validate(node)
+        node = compiler.parse(yaml_content)
+        result = compiler.validate(node)
 
         assert not result.valid
-        assert any("node_id" in e.path for e in result.errors)
+        assert "node_id" in {e.path for e in result.errors}
 
-    def test_compile_generates_python(self) -> None:
+    def test_compile_generates_python(self, compiler: VesperCompiler) -> None:
         """Test that compile generates valid Python code."""
         yaml_content = """
 node_id: compile_test_v1
@@ -159,8 +229,8 @@ flow:
     return_success:
       result: "{result}"
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.compiler.compile(node)
+        node = compiler.parse(yaml_content)
+        code = compiler.compile(node)
 
         # Check code contains expected elements
         assert "AUTO-GENERATED" in code
@@ -169,10 +239,10 @@ flow:
         assert "b: int" in code
         assert "result = a + b" in code
 
-        # Verify it's valid Python by executing it
-        exec(code)
+        # Verify it's valid Python by executing it in a fresh namespace
+        exec(code, {})
 
-    def test_compile_with_validation_step(self) -> None:
+    def test_compile_with_validation_step(self, compiler: VesperCompiler) -> None:
         """Test compilation of validation steps."""
         yaml_content = """
 node_id: validation_test_v1
@@ -205,27 +275,23 @@ flow:
     template: "Hello, {name}!"
     output: greeting
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.compiler.compile(node)
+        node = compiler.parse(yaml_content)
+        code = compiler.compile(node)
 
         assert 'if not (name != "")' in code
         assert "invalid_name" in code
 
-    def test_translate_condition(self) -> None:
+    def test_translate_condition(self, compiler: VesperCompiler) -> None:
         """Test condition translation."""
-        assert self.compiler._translate_condition("a AND b") == "a and b"
-        assert self.compiler._translate_condition("NOT x") == "not x"
-        assert self.compiler._translate_condition("x IN list") == "x in list"
+        assert compiler._translate_condition("a AND b") == "a and b"
+        assert compiler._translate_condition("NOT x") == "not x"
+        assert compiler._translate_condition("x IN list") == "x in list"
 
 
 class TestCodeGeneration:
     """Tests for code generation quality."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-
-    def test_generated_code_has_docstring(self) -> None:
+    def test_generated_code_has_docstring(self, compiler: VesperCompiler) -> None:
         """Test that generated code has proper docstrings."""
         yaml_content = """
 node_id: docstring_test_v1
@@ -246,13 +312,13 @@ flow:
     template: "Hello!"
     output: message
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.compiler.compile(node)
+        node = compiler.parse(yaml_content)
+        code = compiler.compile(node)
 
         assert '"""' in code
         assert "generate_greeting" in code
 
-    def test_generated_code_has_type_hints(self) -> None:
+    def test_generated_code_has_type_hints(self, compiler: VesperCompiler) -> None:
         """Test that generated code has type hints."""
         yaml_content = """
 node_id: typehints_test_v1
@@ -277,8 +343,8 @@ flow:
     expression: "count"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.compiler.compile(node)
+        node = compiler.parse(yaml_content)
+        code = compiler.compile(node)
 
         assert "count: int" in code
         assert "ratio: float" in code
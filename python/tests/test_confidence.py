@@ -2,6 +2,9 @@
 Tests for Confidence Calculation
 """
 
+import math
+
+import pytest
 from vesper_verification.confidence import ConfidenceTracker, RuntimeMetrics
 
 
@@ -40,6 +43,17 @@ class TestRuntimeMetrics:
         )
         assert metrics.divergence_rate == 0.05
 
+    def test_rates_follow_recorded_executions(self):
+        """Rates reflect executions recorded through the tracker."""
+        tracker = ConfidenceTracker()
+        tracker.record_batch("test_node", total=100, divergences=10)
+        tracker.record_execution("test_node", diverged=True)
+
+        metrics = tracker.get_metrics("test_node")
+        assert metrics is not None
+        assert metrics.success_rate == 90 / 101
+        assert metrics.divergence_rate == 11 / 101
+
 
 class TestConfidenceTracker:
     """Tests for ConfidenceTracker."""
@@ -73,8 +87,7 @@ class TestConfidenceTracker:
 
     def test_all_divergences_low_confidence(self):
         """All divergences gives low confidence."""
-        for _ in range(1000):
-            self.tracker.record_execution("test_node", diverged=True)
+        self.tracker.record_batch("test_node", total=1000, divergences=1000)
 
         confidence = self.tracker.get_confidence("test_node")
         assert confidence < 0.01
@@ -82,11 +95,7 @@ class TestConfidenceTracker:
     def test_mixed_record_intermediate_confidence(self):
         """Mixed record gives intermediate confidence."""
         # 5% divergence rate
-        for i in range(1000):
-            self.tracker.record_execution(
-                "test_node",
-                diverged=(i % 20 == 0),  # 5% divergence
-            )
+        self.tracker.record_pattern("test_node", n=1000, div_every=20)
 
         confidence = self.tracker.get_confidence("test_node")
         # Should be around 0.93-0.97 with 5% divergence
@@ -106,6 +115,117 @@ class TestConfidenceTracker:
         # Larger sample should have higher confidence
         assert large_confidence > small_confidence
 
+    def test_wilson_score_matches_textbook_form(self):
+        """Confidence matches the Wilson lower bound written in terms of p."""
+        z = ConfidenceTracker.Z_SCORE
+        for n, divergences in [(100, 0), (1000, 50), (12345, 17), (500, 500)]:
+            p = (n - divergences) / n
+            denominator = 1 + z * z / n
+            center = (p + z * z / (2 * n)) / denominator
+            margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+            expected = max(0.0, center - margin / denominator)
+
+            node_id = f"node_{n}_{divergences}"
+            self.tracker.record_batch(node_id, total=n, divergences=divergences)
+            assert self.tracker.get_confidence(node_id) == pytest.approx(
+                expected, abs=1e-12
+            )
+
+    def test_subclass_z_score_is_used(self):
+        """A subclass overriding Z_SCORE gets bounds computed with its z."""
+
+        class LooseTracker(ConfidenceTracker):
+            Z_SCORE = 1.96
+
+        loose = LooseTracker()
+        for tracker in (self.tracker, loose):
+            tracker.record_batch("node", total=1000, divergences=10)
+
+        z, n, p = 1.96, 1000, 0.99
+        denominator = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denominator
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+        expected = center - margin / denominator
+
+        assert loose.get_confidence("node") == pytest.approx(expected, abs=1e-12)
+        assert loose.all_confidences()["node"] == pytest.approx(expected, abs=1e-12)
+        assert loose.get_confidence("node") > self.tracker.get_confidence("node")
+
+    def test_record_batch_matches_individual_records(self):
+        """record_batch is equivalent to recording each execution."""
+        for i in range(200):
+            self.tracker.record_execution(
+                "looped", diverged=(i < 10), python_error=(i < 3)
+            )
+        self.tracker.record_batch("batched", total=200, divergences=10, python_errors=3)
+
+        looped = self.tracker.get_metrics("looped")
+        batched = self.tracker.get_metrics("batched")
+        assert looped is not None and batched is not None
+        assert batched.total_executions == looped.total_executions
+        assert batched.divergences == looped.divergences
+        assert batched.python_errors == looped.python_errors
+        assert self.tracker.get_confidence("batched") == self.tracker.get_confidence(
+            "looped"
+        )
+
+    def test_confidence_cache_invalidated_on_record(self):
+        """Cached confidence is recomputed once counters change."""
+        self.tracker.record_batch("test_node", total=1000, divergences=0)
+        before = self.tracker.get_confidence("test_node")
+        assert self.tracker.get_confidence("test_node") == before
+
+        self.tracker.record_batch("test_node", total=100, divergences=100)
+        assert self.tracker.get_confidence("test_node") < before
+
+    @pytest.mark.parametrize(
+        "counts",
+        [
+            {"total": -1, "divergences": 0},
+            {"total": 10, "divergences": -1},
+            {"total": 10, "divergences": 11},
+            {"total": 10, "divergences": 0, "python_errors": 11},
+            {"total": 10, "divergences": 0, "direct_errors": -2},
+        ],
+    )
+    def test_record_batch_rejects_invalid_counts(self, counts):
+        """Counts that no sequence of executions could produce are rejected."""
+        with pytest.raises(ValueError):
+            self.tracker.record_batch("test_node", **counts)
+        assert self.tracker.get_metrics("test_node") is None
+
+    def test_all_confidences_matches_get_confidence(self):
+        """all_confidences agrees with per-node get_confidence."""
+        self.tracker.record_batch("perfect", total=1000, divergences=0)
+        self.tracker.record_batch("mixed", total=1000, divergences=50)
+        self.tracker.record_batch("sparse", total=10, divergences=0)
+
+        # A restored copy has no cached scores, so each is computed afresh
+        fresh = ConfidenceTracker.loads(self.tracker.dumps())
+        confidences = self.tracker.all_confidences()
+
+        assert confidences.keys() == {"perfect", "mixed", "sparse"}
+        for node_id, confidence in confidences.items():
+            assert confidence == fresh.get_confidence(node_id)
+            assert confidence == self.tracker.get_confidence(node_id)
+        assert confidences["sparse"] == 0.0
+
+    def test_record_pattern_matches_loop(self):
+        """record_pattern counts the same divergences as the modulo loop."""
+        for n, div_every in [(1000, 20), (101, 7), (50, 0), (3, 5)]:
+            tracker = ConfidenceTracker()
+            for i in range(n):
+                tracker.record_execution(
+                    "looped", diverged=bool(div_every) and i % div_every == 0
+                )
+            tracker.record_pattern("pattern", n=n, div_every=div_every)
+
+            looped = tracker.get_metrics("looped")
+            pattern = tracker.get_metrics("pattern")
+            assert looped is not None and pattern is not None
+            assert pattern.total_executions == looped.total_executions
+            assert pattern.divergences == looped.divergences
+
     def test_record_errors(self):
         """Errors are tracked separately."""
         self.tracker.record_execution(
@@ -157,8 +277,7 @@ class TestConfidenceTracker:
     def test_recommended_mode_high_confidence(self):
         """High confidence recommends direct modes."""
         # Need many more executions for very high confidence
-        for _ in range(100000):
-            self.tracker.record_execution("test_node", diverged=False)
+        self.tracker.record_batch("test_node", total=100000, divergences=0)
 
         mode = self.tracker.get_recommended_mode("test_node")
         # With 100k perfect executions, should be dual_verify or direct_only
@@ -183,6 +302,20 @@ class TestConfidenceTracker:
         assert original_metrics.total_executions == restored_metrics.total_executions
         assert original_metrics.divergences == restored_metrics.divergences
 
+    def test_dumps_loads(self):
+        """Compact encoding roundtrips every counter."""
+        self.tracker.record_batch(
+            "node_a", total=500, divergences=5, python_errors=2, direct_errors=1
+        )
+        self.tracker.record_batch("node_b", total=120, divergences=0)
+
+        restored = ConfidenceTracker.loads(self.tracker.dumps())
+
+        assert restored.get_all_metrics() == self.tracker.get_all_metrics()
+        assert restored.get_confidence("node_a") == self.tracker.get_confidence(
+            "node_a"
+        )
+
 
 class TestConfidenceThresholds:
     """Tests for confidence threshold logic."""
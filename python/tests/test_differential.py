@@ -2,6 +2,10 @@
 Tests for Differential Testing
 """
 
+import copy
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
 import pytest
@@ -116,6 +120,14 @@ class TestOutputComparator:
         )
         assert result is None
 
+    def test_decimal_nan_handling(self):
+        """Decimal NaN compares like float NaN."""
+        result = self.comparator.compare(
+            {"amount": Decimal("NaN")},
+            {"amount": float("nan")},
+        )
+        assert result is None
+
     def test_nan_handling(self):
         """NaN values are handled."""
         result = self.comparator.compare(
@@ -140,6 +152,14 @@ class TestOutputComparator:
         )
         assert result is None
 
+    def test_infinity_vs_large_number(self):
+        """Infinity never matches a finite value under relative epsilon."""
+        result = self.comparator.compare(
+            {"value": float("inf")},
+            {"value": 1e308},
+        )
+        assert result is not None
+
     def test_timestamp_tolerance(self):
         """Timestamps within tolerance are equal."""
         comparator = OutputComparator(timestamp_tolerance_ms=5000)
@@ -158,6 +178,15 @@ class TestOutputComparator:
         )
         assert result is not None
 
+    def test_timestamp_with_offset_falls_back(self):
+        """Timestamps outside the fast-path layout are still compared."""
+        comparator = OutputComparator(timestamp_tolerance_ms=1000)
+        result = comparator.compare(
+            {"time": "2025-01-01T10:00:00Z"},
+            {"time": "2025-01-01T12:00:00.500+02:00"},
+        )
+        assert result is None
+
     def test_none_values(self):
         """None values are handled."""
         result = self.comparator.compare(
@@ -183,6 +212,55 @@ class TestOutputComparator:
         assert result is not None
         assert result["differences"][0]["type"] == "type_mismatch"
 
+    def test_results_independent_across_calls(self):
+        """Reusing a comparator does not leak differences between calls."""
+        first = self.comparator.compare({"a": 1}, {"a": 2})
+        second = self.comparator.compare({"b": 1}, {"b": 3})
+        assert self.comparator.compare({"c": 1}, {"c": 1}) is None
+
+        assert first is not None and second is not None
+        assert [d["path"] for d in first["differences"]] == ["root.a"]
+        assert [d["path"] for d in second["differences"]] == ["root.b"]
+
+    def test_shared_across_threads(self):
+        """One comparator gives correct results when called from many threads."""
+        cases = [
+            ({"items": list(range(50))}, {"items": list(range(50))}, None),
+            ({"items": list(range(50))}, {"items": [*range(49), -1]}, 1),
+            ({"a": {"b": [1, 2, 3]}}, {"a": {"b": [0, 0, 0]}, "c": 1}, 4),
+        ]
+
+        def run(case):
+            python_output, direct_output, expected = case
+            for _ in range(1000):
+                # Fresh copies so the == shortcut can't skip the walk
+                result = self.comparator.compare(
+                    copy.deepcopy(python_output), copy.deepcopy(direct_output)
+                )
+                count = None if result is None else result["count"]
+                if count != expected:
+                    return count
+            return expected
+
+        # Switch threads as often as possible so interleaved calls overlap
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                results = list(pool.map(run, cases * 2))
+        finally:
+            sys.setswitchinterval(interval)
+        assert results == [expected for _, _, expected in cases * 2]
+
+    def test_repeated_paths_reuse_string(self):
+        """Diff paths for the same location are shared between calls."""
+        first = self.comparator.compare({"items": [1, 2]}, {"items": [1, 3]})
+        second = self.comparator.compare({"items": [5, 6]}, {"items": [5, 7]})
+
+        assert first is not None and second is not None
+        assert first["differences"][0]["path"] == "root.items[1]"
+        assert first["differences"][0]["path"] is second["differences"][0]["path"]
+
     def test_relative_epsilon_for_large_numbers(self):
         """Large numbers use relative epsilon."""
         result = self.comparator.compare(
@@ -191,6 +269,14 @@ class TestOutputComparator:
         )
         assert result is None
 
+    def test_equal_subclass_outputs_match(self):
+        """Outputs equal under == match even when builtin subclasses differ."""
+        result = self.comparator.compare(
+            OrderedDict([("status", "ok"), ("items", [1, 2])]),
+            {"items": [1, 2], "status": "ok"},
+        )
+        assert result is None
+
 
 class MockRuntime:
     """Mock runtime for testing."""
@@ -337,6 +423,43 @@ class TestDifferentialTester:
         assert result.total_tests == 50
         assert result.passed == 50
 
+    @pytest.mark.asyncio
+    async def test_max_concurrency_bounds_in_flight(self):
+        """No more than max_concurrency inputs execute at once."""
+        import asyncio
+
+        class SlowRuntime:
+            def __init__(self):
+                self.in_flight = 0
+                self.peak = 0
+
+            async def execute(self, node_id: str, inputs: dict) -> dict:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(0.001)
+                self.in_flight -= 1
+                return {"result": inputs["input"]}
+
+        python_runtime = SlowRuntime()
+        direct_runtime = SlowRuntime()
+
+        tester = DifferentialTester(python_runtime, direct_runtime, max_concurrency=4)
+        result = await tester.test_node(
+            "test_node",
+            [{"input": i} for i in range(20)],
+        )
+
+        assert result.passed == 20
+        assert 1 < python_runtime.peak <= 4
+        assert direct_runtime.peak <= 4
+
+    @pytest.mark.parametrize("max_concurrency", [0, -1])
+    def test_max_concurrency_must_be_positive(self, max_concurrency):
+        """A max_concurrency below 1 is rejected instead of hanging test_node."""
+        runtime = MockRuntime()
+        with pytest.raises(ValueError, match="max_concurrency"):
+            DifferentialTester(runtime, runtime, max_concurrency=max_concurrency)
+
     @pytest.mark.asyncio
     async def test_duration_tracked(self):
         """Execution duration is tracked."""
@@ -363,7 +486,7 @@ class TestDivergence:
             python_output={"result": 2},
             direct_output={"result": 3},
             diff={"differences": [{"path": "result", "type": "value_mismatch"}]},
-            timestamp="2025-01-08T10:00:00Z",
+            timestamp="2025-01-08T10:00:00.123456+00:00",
             trace_id="abc-123",
         )
 
@@ -372,3 +495,5 @@ class TestDivergence:
         assert d["inputs"] == {"x": 1}
         assert d["python_output"] == {"result": 2}
         assert d["direct_output"] == {"result": 3}
+        assert d["timestamp"] == "2025-01-08T10:00:00.123456+00:00"
+        assert div.timestamp_ms == 1736330400123
@@ -8,20 +8,32 @@ These tests verify that:
 4. All flow operations are handled correctly
 """
 
+import ast
+from typing import Any
+
 import pytest
 from vesper.compiler import VesperCompiler
 from vesper.generator import VesperGenerator
 
 
+@pytest.fixture(scope="module")
+def compiler() -> VesperCompiler:
+    """Compiler shared by every test in this module."""
+    return VesperCompiler()
+
+
+@pytest.fixture(scope="module")
+def generator() -> VesperGenerator:
+    """Generator shared by every test in this module."""
+    return VesperGenerator()
+
+
 class TestVesperGenerator:
     """Tests for the VesperGenerator class."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-        self.generator = VesperGenerator()
-
-    def test_generate_simple_function(self) -> None:
+    def test_generate_simple_function(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test generating a simple function."""
         yaml_content = """
 node_id: greet_user_v1
@@ -46,8 +58,8 @@ flow:
     template: "Hello, {name}!"
     output: message
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         # Check basic structure
         assert "AUTO-GENERATED" in code
@@ -57,10 +69,12 @@ flow:
         assert "SuccessResult" in code
         assert "ErrorResult" in code
 
-        # Verify it's valid Python by compiling
-        compile(code, "<generated>", "exec")
+        # Verify it's valid Python by parsing; the code is never executed
+        ast.parse(code)
 
-    def test_generate_with_contracts(self) -> None:
+    def test_generate_with_contracts(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test generating code with preconditions and postconditions."""
         yaml_content = """
 node_id: add_numbers_v1
@@ -93,19 +107,21 @@ flow:
     expression: "a + b"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         # Check contracts are included
         assert "preconditions" in code.lower()
         assert "postconditions" in code.lower()
         assert "ContractViolation" in code
-        assert "a > 0" in code
-        assert "b > 0" in code
+        assert "if not (a > 0):" in code
+        assert "if not (b > 0):" in code
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_with_validation_step(self) -> None:
+    def test_generate_with_validation_step(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test generating code with validation steps."""
         yaml_content = """
 node_id: validate_input_v1
@@ -139,14 +155,16 @@ flow:
     return_success:
       valid: true
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         assert "validation" in code.lower()
         assert "invalid_email" in code
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_with_conditional(self) -> None:
+    def test_generate_with_conditional(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test generating code with conditional steps."""
         yaml_content = """
 node_id: classify_number_v1
@@ -177,13 +195,15 @@ flow:
         template: "non-positive"
         output: classification
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         assert "if" in code
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_with_optional_inputs(self) -> None:
+    def test_generate_with_optional_inputs(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test generating code with optional inputs."""
         yaml_content = """
 node_id: optional_input_v1
@@ -209,17 +229,19 @@ flow:
     template: "{required_field}"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         # Optional field should have default value
         assert "required_field: str" in code
         assert "optional_field" in code
         assert "default_value" in code
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_has_docstrings(self) -> None:
+    def test_generate_has_docstrings(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test that generated code has proper docstrings."""
         yaml_content = """
 node_id: documented_v1
@@ -246,17 +268,19 @@ flow:
     return_success:
       result: "done"
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         # Check for docstrings
         assert '"""' in code
         assert "A well-documented function" in code
         assert "A parameter with description" in code
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_has_type_hints(self) -> None:
+    def test_generate_has_type_hints(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test that generated code has comprehensive type hints."""
         yaml_content = """
 node_id: typed_function_v1
@@ -283,8 +307,8 @@ flow:
     return_success:
       result: "ok"
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         assert "str_param: str" in code
         assert "int_param: int" in code
@@ -292,9 +316,11 @@ flow:
         assert "bool_param: bool" in code
         assert "-> ExecutionResult:" in code
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_includes_logging(self) -> None:
+    def test_generate_includes_logging(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test that generated code includes logging."""
         yaml_content = """
 node_id: logged_v1
@@ -315,16 +341,18 @@ flow:
     expression: "x * 2"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         assert "import logging" in code
         assert "logger" in code
         assert "logger.debug" in code or "logger.info" in code
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_generate_verified_wrapper(self) -> None:
+    def test_generate_verified_wrapper(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test that a verified wrapper function is generated."""
         yaml_content = """
 node_id: verified_v1
@@ -345,24 +373,21 @@ flow:
     expression: "x + 1"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         assert "def verified_v1(" in code
         assert "def verified_v1_verified(" in code
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
 
 class TestGeneratedCodeExecution:
     """Tests that verify generated code actually executes correctly."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-        self.generator = VesperGenerator()
-
-    def test_execute_simple_template(self) -> None:
+    def test_execute_simple_template(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test executing generated code for a simple template."""
         yaml_content = """
 node_id: hello_v1
@@ -384,11 +409,11 @@ flow:
     template: "Hello, {name}!"
     output: message
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
         # Execute the code
-        namespace = {}
+        namespace: dict[str, Any] = {}
         exec(code, namespace)
 
         # Get and call the function
@@ -398,7 +423,9 @@ flow:
         assert result.is_success
         assert result.success.message == "Hello, World!"
 
-    def test_execute_arithmetic(self) -> None:
+    def test_execute_arithmetic(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test executing generated code with arithmetic."""
         yaml_content = """
 node_id: multiply_v1
@@ -422,10 +449,10 @@ flow:
     expression: "x * y"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
-        namespace = {}
+        namespace: dict[str, Any] = {}
         exec(code, namespace)
 
         func = namespace["multiply_v1"]
@@ -434,7 +461,9 @@ flow:
         assert result.is_success
         assert result.success.result == 42
 
-    def test_execute_with_precondition_violation(self) -> None:
+    def test_execute_with_precondition_violation(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test that precondition violations raise exceptions."""
         yaml_content = """
 node_id: positive_only_v1
@@ -459,10 +488,10 @@ flow:
     expression: "x"
     output: result
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
-        namespace = {}
+        namespace: dict[str, Any] = {}
         exec(code, namespace)
 
         func = namespace["positive_only_v1"]
@@ -480,12 +509,9 @@ flow:
 class TestGeneratorEdgeCases:
     """Tests for edge cases and error handling in the generator."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-        self.generator = VesperGenerator()
-
-    def test_empty_flow(self) -> None:
+    def test_empty_flow(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test generating code with no flow steps."""
         yaml_content = """
 node_id: empty_flow_v1
@@ -502,12 +528,14 @@ outputs:
 
 flow: []
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
 
-    def test_special_characters_in_template(self) -> None:
+    def test_special_characters_in_template(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test templates with special characters."""
         yaml_content = """
 node_id: special_chars_v1
@@ -529,10 +557,10 @@ flow:
     template: "Hello, {name}! Welcome to 'Vesper'."
     output: message
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
-        namespace = {}
+        namespace: dict[str, Any] = {}
         exec(code, namespace)
 
         func = namespace["special_chars_v1"]
@@ -540,7 +568,82 @@ flow:
         assert result.is_success
         assert "Welcome to 'Vesper'" in result.success.message
 
-    def test_unknown_operation_type(self) -> None:
+    def test_template_escapes_and_format_specs(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
+        """Test quotes, backslashes, literal braces and format specs in templates."""
+        yaml_content = """
+node_id: escaped_template_v1
+type: function
+intent: escaped_template
+
+inputs:
+  name:
+    type: string
+  count:
+    type: integer
+
+outputs:
+  success:
+    message:
+      type: string
+
+flow:
+  - step: format
+    operation: string_template
+    template: 'Say "hi" to {name!r}\\{{team}} #{count:03d}'
+    output: message
+"""
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
+
+        namespace: dict[str, Any] = {}
+        exec(code, namespace)
+
+        func = namespace["escaped_template_v1"]
+        result = func(name="Ada", count=7)
+        assert result.is_success
+        assert result.success.message == "Say \"hi\" to 'Ada'\\{team} #007"
+
+    def test_conditions_match_compiler(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
+        """Test compiler and generator emit the same precondition expression."""
+        yaml_content = """
+node_id: shared_condition_v1
+type: function
+intent: Shared condition translation
+
+inputs:
+  x:
+    type: string
+
+contracts:
+  preconditions:
+    - "items CONTAINS x And y IS NOT NULL or Not z IN allowed"
+
+flow:
+  - step: done
+    operation: return
+"""
+        node = compiler.parse(yaml_content)
+        condition = node.contracts.preconditions[0]
+
+        expected = "items in x and y is not None or not z in allowed"
+        assert compiler._translate_condition(condition) == expected
+        assert generator._translate_condition(condition) == expected
+        assert f"if not ({expected}):" in compiler.compile(node)
+        assert f"if not ({expected}):" in generator.generate(node)
+
+    def test_translate_condition(self, generator: VesperGenerator) -> None:
+        """Test contract keywords are rewritten regardless of case."""
+        assert generator._translate_condition("a AND NOT b") == "a and not b"
+        assert generator._translate_condition("x is not null") == "x is not None"
+        assert generator._translate_condition("name != ''") == 'name != ""'
+
+    def test_unknown_operation_type(
+        self, compiler: VesperCompiler, generator: VesperGenerator
+    ) -> None:
         """Test handling of unknown operation types."""
         yaml_content = """
 node_id: unknown_op_v1
@@ -561,9 +664,9 @@ flow:
     parameters:
       key: value
 """
-        node = self.compiler.parse(yaml_content)
-        code = self.generator.generate(node)
+        node = compiler.parse(yaml_content)
+        code = generator.generate(node)
 
-        # Should still compile
+        # Should still be valid Python
         assert "TODO" in code
-        compile(code, "<generated>", "exec")
+        ast.parse(code)
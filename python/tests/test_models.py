@@ -185,6 +185,26 @@ class TestValidationResult:
         assert result.valid is True
         assert len(result.warnings) == 1
 
+    def test_round_trips_through_pydantic(self) -> None:
+        """Test results keep the pydantic API for serialization."""
+        result = ValidationResult(valid=True)
+        result.add_error("node_id", "Invalid")
+        result.add_warning("flow", "Empty")
+
+        restored = ValidationResult.model_validate(result.model_dump())
+        assert restored == result
+        assert restored.errors[0].severity == "error"
+        assert restored.warnings[0].severity == "warning"
+
+    def test_results_do_not_share_issue_lists(self) -> None:
+        """Test each result gets its own error and warning lists."""
+        first = ValidationResult(valid=True)
+        first.add_error("node_id", "Invalid")
+
+        second = ValidationResult(valid=True)
+        assert second.errors == []
+        assert second.valid is True
+
 
 class TestMetadata:
     """Tests for the Metadata model."""
@@ -11,14 +11,22 @@ from vesper.runtime import (
 )
 
 
+@pytest.fixture(scope="module")
+def runtime() -> VesperRuntime:
+    """Runtime shared by every test in this module; tests use distinct node IDs."""
+    return VesperRuntime()
+
+
+@pytest.fixture(scope="module")
+def controller() -> MigrationController:
+    """Controller shared by every test in this module; tests use distinct node IDs."""
+    return MigrationController()
+
+
 class TestVesperRuntime:
     """Tests for the VesperRuntime class."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.runtime = VesperRuntime()
-
-    def test_load_simple_node(self) -> None:
+    def test_load_simple_node(self, runtime: VesperRuntime) -> None:
         """Test loading a simple Vesper node."""
         yaml_content = """
 node_id: runtime_test_v1
@@ -44,13 +52,13 @@ flow:
     return_success:
       result: "{result}"
 """
-        node = self.runtime.load_node(yaml_content)
+        node = runtime.load_node(yaml_content)
 
         assert node.node_id == "runtime_test_v1"
-        assert self.runtime.get_node("runtime_test_v1") is not None
+        assert runtime.get_node("runtime_test_v1") is not None
 
-    @pytest.mark.asyncio
-    async def test_execute_simple_node(self) -> None:
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_execute_simple_node(self, runtime: VesperRuntime) -> None:
         """Test executing a simple node."""
         yaml_content = """
 node_id: execute_test_v1
@@ -78,13 +86,13 @@ flow:
     return_success:
       result: "{result}"
 """
-        self.runtime.load_node(yaml_content)
-        result = await self.runtime.execute("execute_test_v1", {"a": 5, "b": 3})
+        runtime.load_node(yaml_content)
+        result = await runtime.execute("execute_test_v1", {"a": 5, "b": 3})
 
         assert result.success
         assert result.data is not None
 
-    def test_execute_sync(self) -> None:
+    def test_execute_sync(self, runtime: VesperRuntime) -> None:
         """Test synchronous execution."""
         yaml_content = """
 node_id: sync_test_v1
@@ -110,59 +118,57 @@ flow:
     return_success:
       doubled: "{doubled}"
 """
-        self.runtime.load_node(yaml_content)
-        result = self.runtime.execute_sync("sync_test_v1", {"value": 7})
+        runtime.load_node(yaml_content)
+        result = runtime.execute_sync("sync_test_v1", {"value": 7})
 
         assert result.success
 
-    def test_execute_unloaded_node(self) -> None:
+    def test_execute_unloaded_node(self, runtime: VesperRuntime) -> None:
         """Test executing a node that hasn't been loaded."""
-        result = self.runtime.execute_sync("nonexistent_v1", {})
+        result = runtime.execute_sync("nonexistent_v1", {})
 
         assert not result.success
         assert "not loaded" in result.error.lower()
 
-    def test_set_execution_mode(self) -> None:
+    def test_set_execution_mode(self, runtime: VesperRuntime) -> None:
         """Test setting execution mode."""
-        self.runtime.set_mode("test_node_v1", ExecutionMode.DUAL_VERIFY)
+        runtime.set_mode("test_node_v1", ExecutionMode.DUAL_VERIFY)
 
-        mode = self.runtime.migration_controller.get_execution_mode("test_node_v1")
+        mode = runtime.migration_controller.get_execution_mode("test_node_v1")
         assert mode == ExecutionMode.DUAL_VERIFY
 
 
 class TestMigrationController:
     """Tests for the MigrationController class."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.controller = MigrationController()
-
-    def test_default_mode_is_python_only(self) -> None:
+    def test_default_mode_is_python_only(self, controller: MigrationController) -> None:
         """Test that default execution mode is Python-only."""
-        mode = self.controller.get_execution_mode("any_node_v1")
+        mode = controller.get_execution_mode("any_node_v1")
         assert mode == ExecutionMode.PYTHON_ONLY
 
-    def test_set_and_get_mode(self) -> None:
+    def test_set_and_get_mode(self, controller: MigrationController) -> None:
         """Test setting and getting execution mode."""
-        self.controller.set_execution_mode("test_v1", ExecutionMode.CANARY_DIRECT)
-        mode = self.controller.get_execution_mode("test_v1")
+        controller.set_execution_mode("test_v1", ExecutionMode.CANARY_DIRECT)
+        mode = controller.get_execution_mode("test_v1")
 
         assert mode == ExecutionMode.CANARY_DIRECT
 
-    def test_metrics_initialized_empty(self) -> None:
+    def test_metrics_initialized_empty(self, controller: MigrationController) -> None:
         """Test that metrics are initialized with zeros."""
-        metrics = self.controller.get_metrics("new_node_v1")
+        metrics = controller.get_metrics("new_node_v1")
 
         assert metrics.total_executions == 0
         assert metrics.divergences == 0
         assert metrics.errors == 0
 
-    def test_confidence_zero_for_few_samples(self) -> None:
+    def test_confidence_zero_for_few_samples(
+        self, controller: MigrationController
+    ) -> None:
         """Test that confidence is zero when samples are insufficient."""
-        confidence = self.controller.calculate_confidence("new_node_v1")
+        confidence = controller.calculate_confidence("new_node_v1")
         assert confidence == 0.0
 
-    def test_record_execution(self) -> None:
+    def test_record_execution(self, controller: MigrationController) -> None:
         """Test recording execution metrics."""
         from vesper.runtime import ExecutionMetrics
 
@@ -170,13 +176,37 @@ class TestMigrationController:
             node_id="record_test_v1", duration_ms=50.0, path_used="python", success=True
         )
 
-        self.controller.record_execution(metrics)
+        controller.record_execution(metrics)
 
-        node_metrics = self.controller.get_metrics("record_test_v1")
+        node_metrics = controller.get_metrics("record_test_v1")
         assert node_metrics.total_executions == 1
         assert node_metrics.python_executions == 1
         assert node_metrics.total_duration_ms == 50.0
 
+    def test_calculate_confidence_bulk_matches_scalar(
+        self, controller: MigrationController
+    ) -> None:
+        """Test bulk confidence agrees with per-node confidence."""
+        from vesper.runtime import ExecutionMetrics
+
+        for i in range(10_000):
+            controller.record_execution(
+                ExecutionMetrics(
+                    node_id="bulk_a_v1" if i % 2 else "bulk_b_v1",
+                    duration_ms=1.0,
+                    path_used="python",
+                    success=True,
+                    divergence=i % 97 == 0,
+                )
+            )
+
+        node_ids = ["bulk_a_v1", "bulk_b_v1", "bulk_unknown_v1"]
+        bulk = controller.calculate_confidence_bulk(node_ids)
+
+        assert bulk == [controller.calculate_confidence(n) for n in node_ids]
+        assert bulk[0] > 0.0
+        assert bulk[2] == 0.0
+
 
 class TestRuntimeMetrics:
     """Tests for RuntimeMetrics calculations."""
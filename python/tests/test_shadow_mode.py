@@ -3,6 +3,12 @@ Tests for Shadow Mode Execution
 """
 
 import asyncio
+import heapq
+import itertools
+import json
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from vesper_verification.confidence import ConfidenceTracker
@@ -10,42 +16,123 @@ from vesper_verification.differential import OutputComparator
 from vesper_verification.shadow_mode import ExecutionResult, ShadowExecutor
 
 
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class FakeClock:
+    """
+    Virtual monotonic clock for simulated runtime latency.
+
+    Sleepers only wake when the test advances the clock, so tests exercise
+    ordering and pending counts without waiting on real time.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+        self._order = itertools.count()
+
+    async def sleep(self, delay: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + delay, next(self._order), future))
+        await future
+
+    async def advance(self, seconds: float) -> None:
+        """Move time forward, waking every sleeper whose deadline has passed."""
+        # Let newly scheduled work run up to its first sleep: the executor's
+        # worker tasks start, then the executions they take
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.now += seconds
+        while self._sleepers and self._sleepers[0][0] <= self.now:
+            _, _, future = heapq.heappop(self._sleepers)
+            _resolve(future)
+
+
 class MockDirectRuntime:
     """Mock direct runtime for testing."""
 
-    def __init__(self, response: dict = None, delay: float = 0.0, fail: bool = False):
+    def __init__(
+        self,
+        response: dict = None,
+        delay: float = 0.0,
+        fail: bool = False,
+        clock: FakeClock = None,
+        trace: bool = False,
+    ):
         self.response = response or {"result": "direct"}
         self.delay = delay
         self.fail = fail
-        self.calls = []
+        self.clock = clock
+        self.call_count = 0
+        self.calls_by_node = Counter()
+        # Full (node_id, inputs) payloads, only kept when tracing
+        self.trace = [] if trace else None
 
     async def execute(self, node_id: str, inputs: dict) -> dict:
-        self.calls.append({"node_id": node_id, "inputs": inputs})
+        self.call_count += 1
+        self.calls_by_node[node_id] += 1
+        if self.trace is not None:
+            self.trace.append((node_id, inputs))
         if self.delay:
-            await asyncio.sleep(self.delay)
+            if self.clock is not None:
+                await self.clock.sleep(self.delay)
+            else:
+                # A bare future resolved by call_later, without asyncio.sleep's
+                # coroutine and cancellation bookkeeping
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                handle = loop.call_later(self.delay, _resolve, waiter)
+                try:
+                    await waiter
+                finally:
+                    handle.cancel()
         if self.fail:
             raise RuntimeError("Simulated direct failure")
         return self.response
 
 
+@pytest.fixture
+def clock():
+    """Fresh virtual clock for each test."""
+    return FakeClock()
+
+
+@pytest.fixture(scope="module")
+def confidence_tracker():
+    """Tracker shared by every test in this module."""
+    return ConfidenceTracker()
+
+
+@pytest.fixture(scope="module")
+def shared_executor(confidence_tracker):
+    """Executor shared by every test in this module."""
+    return ShadowExecutor(
+        direct_runtime=MockDirectRuntime(),
+        comparator=OutputComparator(),
+        confidence_tracker=confidence_tracker,
+    )
+
+
+@pytest.fixture
+def executor(shared_executor, confidence_tracker):
+    """Shared executor with a clean tracker, cancelling leftover executions."""
+    confidence_tracker.clear()
+    yield shared_executor
+    shared_executor.cancel_pending()
+
+
 class TestShadowExecutor:
     """Tests for ShadowExecutor."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.confidence_tracker = ConfidenceTracker()
-        self.comparator = OutputComparator()
-
-    @pytest.mark.asyncio
-    async def test_shadow_execution_non_blocking(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_shadow_execution_non_blocking(self, executor, clock):
         """Shadow execution doesn't block the caller."""
-        direct_runtime = MockDirectRuntime(delay=0.1)
+        direct_runtime = MockDirectRuntime(delay=0.1, clock=clock)
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
-        )
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "python"},
@@ -66,20 +153,22 @@ class TestShadowExecutor:
         # Should be much less than the 0.1s delay
         assert elapsed < 0.05
 
+        # The shadow is still waiting on its simulated latency
+        await clock.advance(0.05)
+        assert executor.pending_count == 1
+
         # Wait for shadow to complete
+        await clock.advance(0.05)
         await executor.wait_for_pending(timeout=1.0)
-        assert len(direct_runtime.calls) == 1
+        assert direct_runtime.call_count == 1
 
-    @pytest.mark.asyncio
-    async def test_no_divergence_records_success(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_no_divergence_records_success(self, executor, confidence_tracker):
         """No divergence records success in confidence tracker."""
-        direct_runtime = MockDirectRuntime(response={"result": "same"})
+        # A short real delay: the outcome must not depend on latency
+        direct_runtime = MockDirectRuntime(response={"result": "same"}, delay=0.001)
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
-        )
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "same"},
@@ -92,21 +181,17 @@ class TestShadowExecutor:
         executor.execute_shadow("test_node", {"input": 1}, python_result)
         await executor.wait_for_pending(timeout=1.0)
 
-        metrics = self.confidence_tracker.get_metrics("test_node")
+        metrics = confidence_tracker.get_metrics("test_node")
         assert metrics is not None
         assert metrics.total_executions == 1
         assert metrics.divergences == 0
 
-    @pytest.mark.asyncio
-    async def test_divergence_records_failure(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_divergence_records_failure(self, executor, confidence_tracker):
         """Divergence records failure in confidence tracker."""
         direct_runtime = MockDirectRuntime(response={"result": "different"})
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
-        )
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "python"},
@@ -119,21 +204,90 @@ class TestShadowExecutor:
         executor.execute_shadow("test_node", {"input": 1}, python_result)
         await executor.wait_for_pending(timeout=1.0)
 
-        metrics = self.confidence_tracker.get_metrics("test_node")
+        metrics = confidence_tracker.get_metrics("test_node")
         assert metrics is not None
         assert metrics.total_executions == 1
         assert metrics.divergences == 1
 
-    @pytest.mark.asyncio
-    async def test_direct_error_counts_as_divergence(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_compare_in_executor(self, confidence_tracker):
+        """Comparisons can run on a caller-supplied executor."""
+        confidence_tracker.clear()
+        compare_threads = set()
+
+        class RecordingComparator(OutputComparator):
+            def compare(self, python_output, direct_output):
+                compare_threads.add(threading.current_thread())
+                return super().compare(python_output, direct_output)
+
+        python_result = ExecutionResult(
+            output={"result": "python"},
+            execution_time_ms=10.0,
+            path_used="python",
+            trace_id="test-trace",
+            success=True,
+        )
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            executor = ShadowExecutor(
+                direct_runtime=MockDirectRuntime(response={"result": "python"}),
+                comparator=RecordingComparator(),
+                confidence_tracker=confidence_tracker,
+                compare_executor=pool,
+            )
+            executor.execute_shadow_many(
+                "test_node", [{"input": i} for i in range(8)], python_result
+            )
+            executor.execute_shadow("test_node", {"input": 8}, python_result)
+            await executor.wait_for_pending(timeout=1.0)
+            executor.swap_runtime(MockDirectRuntime(response={"result": "other"}))
+            executor.execute_shadow("test_node", {"input": 9}, python_result)
+            await executor.wait_for_pending(timeout=1.0)
+
+        metrics = confidence_tracker.get_metrics("test_node")
+        assert metrics is not None
+        assert metrics.total_executions == 10
+        assert metrics.divergences == 1
+        assert threading.main_thread() not in compare_threads
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_trickled_submissions_start_immediately(
+        self, executor, confidence_tracker, clock
+    ):
+        """A submission starts at once instead of waiting for earlier ones."""
+        executor.swap_runtime(MockDirectRuntime(delay=1.0, clock=clock))
+        python_result = ExecutionResult(
+            output={"result": "direct"},
+            execution_time_ms=10.0,
+            path_used="python",
+            trace_id="test-trace",
+            success=True,
+        )
+
+        executor.execute_shadow("test_node", {"input": 1}, python_result)
+        await clock.advance(0.5)
+        executor.execute_shadow("test_node", {"input": 2}, python_result)
+        assert executor.pending_count == 2
+
+        # The first finishes on schedule while the second is still running
+        await clock.advance(0.5)
+        await asyncio.sleep(0)
+        assert confidence_tracker.get_metrics("test_node").total_executions == 1
+        assert executor.pending_count == 1
+
+        await clock.advance(0.5)
+        assert await executor.wait_for_pending(timeout=1.0) == 1
+        assert confidence_tracker.get_metrics("test_node").total_executions == 2
+        assert executor.pending_count == 0
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_direct_error_counts_as_divergence(
+        self, executor, confidence_tracker
+    ):
         """Direct runtime error counts as divergence."""
         direct_runtime = MockDirectRuntime(fail=True)
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
-        )
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "python"},
@@ -146,21 +300,17 @@ class TestShadowExecutor:
         executor.execute_shadow("test_node", {"input": 1}, python_result)
         await executor.wait_for_pending(timeout=1.0)
 
-        metrics = self.confidence_tracker.get_metrics("test_node")
+        metrics = confidence_tracker.get_metrics("test_node")
         assert metrics is not None
         assert metrics.divergences == 1
         assert metrics.direct_errors == 1
 
-    @pytest.mark.asyncio
-    async def test_pending_count(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_pending_count(self, executor, clock):
         """Pending count tracks active shadow executions."""
-        direct_runtime = MockDirectRuntime(delay=0.1)
+        direct_runtime = MockDirectRuntime(delay=0.1, clock=clock, trace=True)
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
-        )
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "python"},
@@ -171,24 +321,73 @@ class TestShadowExecutor:
         )
 
         # Launch multiple shadow executions
-        for i in range(5):
-            executor.execute_shadow("test_node", {"input": i}, python_result)
+        executor.execute_shadow_many(
+            "test_node", [{"input": i} for i in range(5)], python_result
+        )
 
         assert executor.pending_count == 5
 
+        await clock.advance(0.1)
         await executor.wait_for_pending(timeout=1.0)
         assert executor.pending_count == 0
+        assert direct_runtime.calls_by_node == {"test_node": 5}
+        assert [inputs["input"] for _, inputs in direct_runtime.trace] == list(range(5))
 
-    @pytest.mark.asyncio
-    async def test_wait_for_pending_timeout(self):
-        """Wait for pending handles timeout."""
-        direct_runtime = MockDirectRuntime(delay=1.0)  # Long delay
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_slow_execution_does_not_hold_up_others(self, executor, clock):
+        """Later work completes, and is counted done, while a slow call runs."""
+
+        class VariableLatencyRuntime:
+            def __init__(self):
+                self.finished = []
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
+            async def execute(self, node_id: str, inputs: dict) -> dict:
+                await clock.sleep(inputs["delay"])
+                self.finished.append(inputs["input"])
+                return {"result": "python"}
+
+        direct_runtime = VariableLatencyRuntime()
+        executor.swap_runtime(direct_runtime)
+
+        python_result = ExecutionResult(
+            output={"result": "python"},
+            execution_time_ms=10.0,
+            path_used="python",
+            trace_id="test-trace",
+            success=True,
+        )
+
+        executor.execute_shadow_many(
+            "test_node",
+            [{"input": "slow", "delay": 10.0}, {"input": "fast", "delay": 0.1}],
+            python_result,
         )
+        await clock.advance(0.1)
+        # Let the woken execution finish
+        await asyncio.sleep(0)
+        assert direct_runtime.finished == ["fast"]
+        assert executor.pending_count == 1
+
+        executor.execute_shadow(
+            "test_node", {"input": "late", "delay": 0.1}, python_result
+        )
+        await clock.advance(0.1)
+        await asyncio.sleep(0)
+        assert direct_runtime.finished == ["fast", "late"]
+        assert executor.pending_count == 1
+
+        await clock.advance(10.0)
+        await executor.wait_for_pending(timeout=1.0)
+        assert direct_runtime.finished == ["fast", "late", "slow"]
+        assert executor.pending_count == 0
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_wait_for_pending_timeout(self, executor, clock):
+        """Wait for pending handles timeout."""
+        # Never completes: the clock is not advanced past the delay
+        direct_runtime = MockDirectRuntime(delay=1.0, clock=clock)
+
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "python"},
@@ -201,19 +400,61 @@ class TestShadowExecutor:
         executor.execute_shadow("test_node", {"input": 1}, python_result)
 
         # This should timeout
-        count = await executor.wait_for_pending(timeout=0.1)
+        count = await executor.wait_for_pending(timeout=0.01)
         assert count == 1  # One was pending
 
-    @pytest.mark.asyncio
-    async def test_multiple_nodes(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_timed_out_wait_leaves_execution_running(self, executor, clock):
+        """A waiter timing out doesn't cancel the execution or other waiters."""
+        direct_runtime = MockDirectRuntime(delay=1.0, clock=clock)
+        executor.swap_runtime(direct_runtime)
+
+        python_result = ExecutionResult(
+            output={"result": "python"},
+            execution_time_ms=10.0,
+            path_used="python",
+            trace_id="test-trace",
+            success=True,
+        )
+
+        executor.execute_shadow("test_node", {"input": 1}, python_result)
+        patient = asyncio.create_task(executor.wait_for_pending(timeout=1.0))
+
+        assert await executor.wait_for_pending(timeout=0.01) == 1
+        assert executor.pending_count == 1
+
+        await clock.advance(1.0)
+        assert await patient == 1
+        assert executor.pending_count == 0
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_cancel_pending(self, executor, confidence_tracker, clock):
+        """Cancelled shadow executions are dropped without being recorded."""
+        executor.swap_runtime(MockDirectRuntime(delay=1.0, clock=clock))
+
+        python_result = ExecutionResult(
+            output={"result": "python"},
+            execution_time_ms=10.0,
+            path_used="python",
+            trace_id="test-trace",
+            success=True,
+        )
+
+        executor.execute_shadow("test_node", {"input": 1}, python_result)
+        executor.execute_shadow("test_node", {"input": 2}, python_result)
+
+        assert executor.cancel_pending() == 2
+        assert executor.pending_count == 0
+        assert await executor.wait_for_pending(timeout=0.01) == 0
+        await clock.advance(1.0)
+        assert confidence_tracker.get_metrics("test_node") is None
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_multiple_nodes(self, executor, confidence_tracker):
         """Shadow execution works for multiple nodes."""
         direct_runtime = MockDirectRuntime(response={"result": "same"})
 
-        executor = ShadowExecutor(
-            direct_runtime=direct_runtime,
-            comparator=self.comparator,
-            confidence_tracker=self.confidence_tracker,
-        )
+        executor.swap_runtime(direct_runtime)
 
         python_result = ExecutionResult(
             output={"result": "same"},
@@ -229,8 +470,8 @@ class TestShadowExecutor:
 
         await executor.wait_for_pending(timeout=1.0)
 
-        assert self.confidence_tracker.get_metrics("node_a").total_executions == 2
-        assert self.confidence_tracker.get_metrics("node_b").total_executions == 1
+        assert confidence_tracker.get_metrics("node_a").total_executions == 2
+        assert confidence_tracker.get_metrics("node_b").total_executions == 1
 
 
 class TestExecutionResult:
@@ -267,3 +508,16 @@ class TestExecutionResult:
         d = result.to_dict()
         assert d["success"] is False
         assert d["error"] == "test error"
+
+    def test_to_json_bytes_matches_to_dict(self):
+        """JSON encoding carries the same fields as to_dict."""
+        result = ExecutionResult(
+            output={"result": 42, "items": [1, None]},
+            execution_time_ms=10.5,
+            path_used="direct",
+            trace_id="abc-123",
+            success=False,
+            error=RuntimeError("test error"),
+        )
+
+        assert json.loads(result.to_json_bytes()) == result.to_dict()
@@ -9,67 +9,48 @@ These tests verify that:
 5. Best practices are suggested
 """
 
+import pytest
 from vesper.compiler import VesperCompiler
-from vesper.validator import VesperValidator
+from vesper.validator import ValidationResult, VesperValidator
 
+# Keep the module on one worker under `pytest -n auto --dist=loadgroup`, so the
+# shared compiler/validator fixtures stay warm
+pytestmark = pytest.mark.xdist_group(name="validator")
 
-class TestVesperValidator:
-    """Tests for the VesperValidator class."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-        self.validator = VesperValidator()
+@pytest.fixture(scope="module")
+def compiler() -> VesperCompiler:
+    """Compiler shared by all tests in this module."""
+    return VesperCompiler()
 
-    def test_validate_valid_node(self) -> None:
-        """Test that a valid node passes validation."""
-        yaml_content = """
-node_id: valid_node_v1
-type: function
-intent: A valid function node
 
-inputs:
-  name:
-    type: string
-    required: true
+@pytest.fixture(scope="module")
+def validator() -> VesperValidator:
+    """Validator shared by all tests in this module; it holds no state."""
+    return VesperValidator()
 
-outputs:
-  success:
-    message:
-      type: string
 
-flow:
-  - step: greet
-    operation: string_template
-    template: "Hello, {name}!"
-    output: message
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert result.valid
-        assert len(result.errors) == 0
-
-    def test_validate_invalid_node_id_format(self) -> None:
-        """Test that invalid node_id format is rejected."""
-        yaml_content = """
+# (spec, issue path, severity, lowercase message fragment) for specs that
+# should trip a particular rule
+VALIDATION_CASES = [
+    pytest.param(
+        # Invalid node_id format is rejected
+        """
 node_id: InvalidNodeIdWithoutVersion
 type: function
 intent: Invalid ID format
 
 inputs: {}
 flow: []
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert not result.valid
-        assert any("node_id" in e.path for e in result.errors)
-        assert any("format" in e.message.lower() for e in result.errors)
-
-    def test_validate_missing_input_type(self) -> None:
-        """Test that missing input types are flagged."""
-        yaml_content = """
+""",
+        "node_id",
+        "error",
+        "invalid node_id format",
+        id="invalid_node_id_format",
+    ),
+    pytest.param(
+        # Missing input types are flagged
+        """
 node_id: missing_type_v1
 type: function
 intent: Missing input type
@@ -84,17 +65,15 @@ outputs:
 flow:
   - step: noop
     operation: return
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        # This should generate an error or warning about missing type
-        has_type_issue = any("type" in issue.message.lower() for issue in result.issues)
-        assert has_type_issue
-
-    def test_validate_unknown_type(self) -> None:
-        """Test that unknown types are warned about."""
-        yaml_content = """
+""",
+        "inputs.name",
+        "error",
+        "must have a type",
+        id="missing_input_type",
+    ),
+    pytest.param(
+        # Unknown types are warned about
+        """
 node_id: unknown_type_v1
 type: function
 intent: Unknown type
@@ -110,18 +89,15 @@ outputs:
 flow:
   - step: noop
     operation: return
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "unknown" in w.message.lower() and "type" in w.message.lower()
-            for w in result.warnings
-        )
-
-    def test_validate_duplicate_step_names(self) -> None:
-        """Test that duplicate step names are rejected."""
-        yaml_content = """
+""",
+        "inputs.data",
+        "warning",
+        "unknown type",
+        id="unknown_type",
+    ),
+    pytest.param(
+        # Duplicate step names are rejected
+        """
 node_id: duplicate_steps_v1
 type: function
 intent: Duplicate step names
@@ -144,15 +120,15 @@ flow:
     operation: arithmetic
     expression: "result + 1"
     output: result
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any("duplicate" in e.message.lower() for e in result.errors)
-
-    def test_validate_unknown_operation(self) -> None:
-        """Test that unknown operations are warned about."""
-        yaml_content = """
+""",
+        "flow[1]",
+        "error",
+        "duplicate step name",
+        id="duplicate_step_names",
+    ),
+    pytest.param(
+        # Unknown operations are warned about
+        """
 node_id: unknown_op_v1
 type: function
 intent: Unknown operation
@@ -168,18 +144,15 @@ outputs:
 flow:
   - step: unknown
     operation: teleport_to_mars
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "unknown" in w.message.lower() and "operation" in w.message.lower()
-            for w in result.warnings
-        )
-
-    def test_validate_empty_flow_warning(self) -> None:
-        """Test that empty flow generates a warning."""
-        yaml_content = """
+""",
+        "flow[0].operation",
+        "warning",
+        "unknown operation",
+        id="unknown_operation",
+    ),
+    pytest.param(
+        # Empty flow generates a warning
+        """
 node_id: empty_flow_v1
 type: function
 intent: Empty flow
@@ -193,17 +166,15 @@ outputs:
     result: string
 
 flow: []
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "flow" in w.path and "no flow" in w.message.lower() for w in result.warnings
-        )
-
-    def test_validate_missing_template(self) -> None:
-        """Test that string_template without template is an error."""
-        yaml_content = """
+""",
+        "flow",
+        "warning",
+        "no flow steps",
+        id="empty_flow_warning",
+    ),
+    pytest.param(
+        # String_template without template is an error
+        """
 node_id: missing_template_v1
 type: function
 intent: Missing template
@@ -220,18 +191,15 @@ flow:
   - step: format
     operation: string_template
     output: result
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "template" in e.path.lower() and "requires" in e.message.lower()
-            for e in result.errors
-        )
-
-    def test_validate_missing_expression(self) -> None:
-        """Test that arithmetic without expression is an error."""
-        yaml_content = """
+""",
+        "flow[0].template",
+        "error",
+        "requires a template",
+        id="missing_template",
+    ),
+    pytest.param(
+        # Arithmetic without expression is an error
+        """
 node_id: missing_expr_v1
 type: function
 intent: Missing expression
@@ -248,18 +216,15 @@ flow:
   - step: compute
     operation: arithmetic
     output: result
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "expression" in e.path.lower() and "requires" in e.message.lower()
-            for e in result.errors
-        )
-
-    def test_validate_conflicting_capabilities(self) -> None:
-        """Test that conflicting security capabilities are rejected."""
-        yaml_content = """
+""",
+        "flow[0].expression",
+        "error",
+        "requires an expression",
+        id="missing_expression",
+    ),
+    pytest.param(
+        # Conflicting security capabilities are rejected
+        """
 node_id: conflict_cap_v1
 type: function
 intent: Conflicting capabilities
@@ -281,19 +246,15 @@ security:
 flow:
   - step: noop
     operation: return
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "conflict" in e.message.lower()
-            or "both required and denied" in e.message.lower()
-            for e in result.errors
-        )
-
-    def test_validate_dangerous_capabilities_warning(self) -> None:
-        """Test that dangerous capabilities generate warnings."""
-        yaml_content = """
+""",
+        "security",
+        "error",
+        "both required and denied",
+        id="conflicting_capabilities",
+    ),
+    pytest.param(
+        # Dangerous capabilities generate warnings
+        """
 node_id: dangerous_cap_v1
 type: function
 intent: Dangerous capabilities
@@ -313,18 +274,15 @@ security:
 flow:
   - step: noop
     operation: return
-"""
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
-
-        assert any(
-            "dangerous" in w.message.lower() or "shell_command" in w.message.lower()
-            for w in result.warnings
-        )
-
-    def test_validate_unbalanced_parentheses(self) -> None:
-        """Test that unbalanced parentheses in conditions are caught."""
-        yaml_content = """
+""",
+        "security.capabilities_required",
+        "warning",
+        "potentially dangerous",
+        id="dangerous_capabilities_warning",
+    ),
+    pytest.param(
+        # Unbalanced parentheses in conditions are caught
+        """
 node_id: unbalanced_v1
 type: function
 intent: Unbalanced parentheses
@@ -344,25 +302,102 @@ contracts:
 flow:
   - step: noop
     operation: return
+""",
+        "contracts.preconditions[0]",
+        "warning",
+        "unbalanced parentheses",
+        id="unbalanced_parentheses",
+    ),
+    pytest.param(
+        # A closing parenthesis before its opener is caught
+        """
+node_id: misordered_v1
+type: function
+intent: Misordered parentheses
+
+inputs:
+  x:
+    type: integer
+
+outputs:
+  success:
+    result: integer
+
+contracts:
+  preconditions:
+    - "x > 0) and (x < 10"
+
+flow:
+  - step: noop
+    operation: return
+""",
+        "contracts.preconditions[0]",
+        "warning",
+        "unbalanced parentheses",
+        id="misordered_parentheses",
+    ),
+]
+
+
+class TestVesperValidator:
+    """Tests for the VesperValidator class."""
+
+    def test_validate_valid_node(self, validator: VesperValidator) -> None:
+        """Test that a valid node passes validation."""
+        yaml_content = """
+node_id: valid_node_v1
+type: function
+intent: A valid function node
+
+inputs:
+  name:
+    type: string
+    required: true
+
+outputs:
+  success:
+    message:
+      type: string
+
+flow:
+  - step: greet
+    operation: string_template
+    template: "Hello, {name}!"
+    output: message
 """
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
+        result = validator.validate_source(yaml_content)
 
-        assert any(
-            "parentheses" in w.message.lower() or "unbalanced" in w.message.lower()
-            for w in result.warnings
+        assert result.valid
+        assert len(result.errors) == 0
+
+    @pytest.mark.parametrize("yaml_content,path,severity,fragment", VALIDATION_CASES)
+    def test_validation_cases(
+        self,
+        validator: VesperValidator,
+        yaml_content: str,
+        path: str,
+        severity: str,
+        fragment: str,
+    ) -> None:
+        """Test that each spec in the table is flagged by its rule."""
+        result = validator.validate_source(yaml_content)
+
+        matches = [
+            i
+            for i in result.issues
+            if i.path == path and i.severity == severity and fragment in i.message_lower
+        ]
+        assert matches, (
+            f"expected a {severity} at {path!r} mentioning {fragment!r}; "
+            f"issues: {result.issues}"
         )
+        assert result.valid == (severity != "error"), result.issues
 
 
 class TestValidatorBestPractices:
     """Tests for best practice suggestions."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-        self.validator = VesperValidator()
-
-    def test_suggest_description(self) -> None:
+    def test_suggest_description(self, validator: VesperValidator) -> None:
         """Test that missing description generates a suggestion."""
         yaml_content = """
 node_id: no_description_v1
@@ -381,12 +416,11 @@ flow:
   - step: noop
     operation: return
 """
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
+        result = validator.validate_source(yaml_content)
 
         assert any("description" in i.path.lower() for i in result.infos)
 
-    def test_suggest_tests(self) -> None:
+    def test_suggest_tests(self, validator: VesperValidator) -> None:
         """Test that missing tests generate a suggestion."""
         yaml_content = """
 node_id: no_tests_v1
@@ -405,24 +439,19 @@ flow:
   - step: noop
     operation: return
 """
-        node = self.compiler.parse(yaml_content)
-        result = self.validator.validate(node)
+        result = validator.validate_source(yaml_content)
 
         assert any(
-            "test" in i.path.lower() or "test" in i.message.lower()
-            for i in result.infos
+            "test" in i.path.lower() or "test" in i.message_lower for i in result.infos
         )
 
 
 class TestValidatorStrictMode:
     """Tests for strict validation mode."""
 
-    def setup_method(self) -> None:
-        """Set up test fixtures."""
-        self.compiler = VesperCompiler()
-        self.validator = VesperValidator()
-
-    def test_strict_mode_converts_warnings_to_errors(self) -> None:
+    def test_strict_mode_converts_warnings_to_errors(
+        self, compiler: VesperCompiler, validator: VesperValidator
+    ) -> None:
         """Test that strict mode treats warnings as errors."""
         yaml_content = """
 node_id: warning_node_v1
@@ -441,12 +470,111 @@ flow:
   - step: noop
     operation: return
 """
-        node = self.compiler.parse(yaml_content)
+        node = compiler.parse(yaml_content)
 
         # Normal mode - should be valid (only warnings)
-        normal_result = self.validator.validate(node, strict=False)
+        normal_result = validator.validate(node, strict=False)
 
         # Strict mode - warnings become errors
-        strict_result = self.validator.validate(node, strict=True)
+        strict_result = validator.validate(node, strict=True)
 
         assert len(strict_result.errors) >= len(normal_result.warnings)
+
+    def test_repeated_results_are_independent(
+        self, compiler: VesperCompiler, validator: VesperValidator
+    ) -> None:
+        """Test repeated validation of one spec returns fresh results."""
+        yaml_content = """
+node_id: repeated_node_v1
+type: function
+intent: Validated twice
+
+inputs:
+  x:
+    type: unknown_type_xyz
+
+outputs:
+  success:
+    result: string
+
+flow:
+  - step: noop
+    operation: return
+"""
+        node = compiler.parse(yaml_content)
+
+        strict_result = validator.validate(node, strict=True)
+        normal_result = validator.validate(node)
+        assert normal_result.warnings
+        assert not strict_result.warnings
+
+        normal_result.add_error("node_id", "Added by caller")
+        again = validator.validate(compiler.parse(yaml_content))
+        assert again.issues == validator.validate(node).issues
+        assert not any(i.message == "Added by caller" for i in again.issues)
+
+    def test_validate_source_matches_parse_then_validate(
+        self, compiler: VesperCompiler, validator: VesperValidator
+    ) -> None:
+        """Test the fused entry point reports the same issues."""
+        yaml_content = """
+node_id: fused_node_v1
+type: function
+intent: Parsed and validated together
+
+inputs:
+  x:
+    type: unknown_type_xyz
+
+outputs:
+  success:
+    result: string
+
+flow:
+  - step: noop
+    operation: return
+"""
+        for strict in (False, True):
+            fused = validator.validate_source(yaml_content, strict=strict)
+            separate = validator.validate(compiler.parse(yaml_content), strict=strict)
+            assert fused == separate
+
+    def test_issues_bucketed_by_top_level_path(
+        self, validator: VesperValidator
+    ) -> None:
+        """Test by_path groups issues under their first path component."""
+        yaml_content = """
+node_id: BadNodeId
+type: function
+intent: Bucketed issues
+
+inputs:
+  x:
+    type: unknown_type_xyz
+
+outputs:
+  success:
+    result: string
+
+flow:
+  - step: compute
+    operation: arithmetic
+    output: result
+"""
+        result = validator.validate_source(yaml_content, strict=True)
+
+        assert sorted(i.path for i in result.issues) == sorted(
+            i.path for bucket in result.by_path.values() for i in bucket
+        )
+        assert all(i.path.startswith("flow[") for i in result.by_path["flow"])
+        assert all(i.path.startswith("inputs.") for i in result.by_path["inputs"])
+        assert result.by_path["node_id"]
+        assert not result.by_path["outputs.success"]
+
+        merged = ValidationResult()
+        merged.merge(result)
+        assert merged.by_path["flow"] == result.by_path["flow"]
+
+        result.add_info("flow[9].output", "Added after indexing")
+        assert result.by_path["flow"][-1].path == "flow[9].output"
+        assert merged.by_path["flow"][-1].path != "flow[9].output"
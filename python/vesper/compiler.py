@@ -6,8 +6,11 @@ Parses Vesper specification files and generates Python code.
 
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +23,102 @@ from vesper.models import (
     VesperNode,
 )
 
+# Default number of parsed specs each VesperCompiler keeps for parse()
+PARSE_CACHE_SIZE = 32
+
+# Vesper condition keywords and their Python spelling, applied in order.
+# Multi-word patterns come first so single-word rules cannot split them.
+# CONTAINS is only matched in upper case, so identifiers named "contains"
+# are left alone.
+_CONDITION_REWRITES = (
+    *(
+        (re.compile(pattern, re.IGNORECASE), replacement)
+        for pattern, replacement in (
+            (r"\bIS NOT NULL\b", "is not None"),
+            (r"\bIS NULL\b", "is None"),
+            (r"\bAND\b", "and"),
+            (r"\bOR\b", "or"),
+            (r"\bNOT\b", "not"),
+            (r"\bIN\b", "in"),
+        )
+    ),
+    (re.compile(r"\bCONTAINS\b"), "in"),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def translate_condition(condition: str) -> str:
+    """
+    Translate a Vesper condition to a Python expression.
+
+    Shared by VesperCompiler and VesperGenerator so a contract compiles to
+    the same expression on either path. Pure string rewrite, so results are
+    cached across instances.
+
+    Args:
+        condition: Condition as written in the specification
+
+    Returns:
+        Equivalent Python expression
+    """
+    result = condition
+    for pattern, replacement in _CONDITION_REWRITES:
+        result = pattern.sub(replacement, result)
+
+    # Replace string literals
+    return result.replace("''", '""')
+
+
+def _parse_content(content: str) -> VesperNode:
+    """Parse YAML specification text into a VesperNode."""
+    try:
+        data = yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Failed to parse YAML: {e}") from e
+
+    return _build_node(data)
+
+
+def _build_node(data: dict[str, Any]) -> VesperNode:
+    """Normalize a loaded specification mapping and build a VesperNode."""
+    # Normalize inputs to InputSpec objects
+    if "inputs" in data:
+        normalized_inputs = {}
+        for name, spec in data["inputs"].items():
+            if isinstance(spec, dict):
+                normalized_inputs[name] = spec
+            else:
+                normalized_inputs[name] = {"type": str(spec)}
+        data["inputs"] = normalized_inputs
+
+    # Handle outputs format
+    if "outputs" in data:
+        outputs = data["outputs"]
+        # If outputs is not in success/error format, wrap it
+        if "success" not in outputs and "error" not in outputs:
+            # Assume it's all success outputs
+            data["outputs"] = {"success": outputs, "error": {}}
+
+    return VesperNode(**data)
+
+
+def _read_source(source: str | Path) -> str:
+    """Return the YAML text of a specification given as a file path or string."""
+    if isinstance(source, Path):
+        with open(source) as f:
+            return f.read()
+    if "\n" not in source and len(source) < 256:
+        # Only check if it's a file if it looks like a path (no newlines, reasonable length)
+        try:
+            path = Path(source)
+            if path.exists():
+                with open(path) as f:
+                    return f.read()
+        except (OSError, ValueError):
+            # If path operations fail, treat as YAML content
+            pass
+    return source
+
 
 class VesperCompiler:
     """
@@ -32,15 +131,23 @@ class VesperCompiler:
     4. Emit to .py file
     """
 
-    def __init__(self, schema_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        schema_path: Path | None = None,
+        parse_cache_size: int = PARSE_CACHE_SIZE,
+    ) -> None:
         """
         Initialize the compiler.
 
         Args:
             schema_path: Optional path to JSON schema for validation
+            parse_cache_size: Number of parsed specs kept by parse(), keyed
+                by their YAML text; 0 disables the cache
         """
         self.schema_path = schema_path
         self._schema: dict[str, Any] | None = None
+        self.parse_cache_size = parse_cache_size
+        self._parse_cache: OrderedDict[str, VesperNode] = OrderedDict()
 
     @property
     def schema(self) -> dict[str, Any] | None:
@@ -54,6 +161,9 @@ class VesperCompiler:
         """
         Parse a Vesper specification from a file or string.
 
+        The most recent ``parse_cache_size`` specs are cached on this
+        compiler by YAML text; each call returns an independent copy.
+
         Args:
             source: Either a file path or YAML string
 
@@ -63,49 +173,40 @@ class VesperCompiler:
         Raises:
             ValueError: If parsing fails
         """
-        if isinstance(source, Path):
-            path = source
-            with open(path) as f:
-                content = f.read()
-        elif isinstance(source, str) and "\n" not in source and len(source) < 256:
-            # Only check if it's a file if it looks like a path (no newlines, reasonable length)
-            try:
-                path = Path(source)
-                if path.exists():
-                    with open(path) as f:
-                        content = f.read()
-                else:
-                    content = source
-            except (OSError, ValueError):
-                # If path operations fail, treat as YAML content
-                content = source
+        content = _read_source(source)
+        if self.parse_cache_size <= 0:
+            return _parse_content(content)
+
+        cache = self._parse_cache
+        node = cache.get(content)
+        if node is None:
+            node = cache[content] = _parse_content(content)
+            if len(cache) > self.parse_cache_size:
+                cache.popitem(last=False)
         else:
-            content = source
+            cache.move_to_end(content)
+        # Specs are mutable pydantic models, so hand out a private copy of
+        # the cached parse; copying costs a few percent of a fresh parse
+        return node.model_copy(deep=True)
 
-        try:
-            data = yaml.safe_load(content)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Failed to parse YAML: {e}") from e
-
-        # Normalize inputs to InputSpec objects
-        if "inputs" in data:
-            normalized_inputs = {}
-            for name, spec in data["inputs"].items():
-                if isinstance(spec, dict):
-                    normalized_inputs[name] = spec
-                else:
-                    normalized_inputs[name] = {"type": str(spec)}
-            data["inputs"] = normalized_inputs
+    def cache_clear(self) -> None:
+        """Drop every spec cached by parse()."""
+        self._parse_cache.clear()
+
+    def parse_dict(self, data: dict[str, Any]) -> VesperNode:
+        """
+        Build a Vesper node from an already-loaded specification mapping.
 
-        # Handle outputs format
-        if "outputs" in data:
-            outputs = data["outputs"]
-            # If outputs is not in success/error format, wrap it
-            if "success" not in outputs and "error" not in outputs:
-                # Assume it's all success outputs
-                data["outputs"] = {"success": outputs, "error": {}}
+        Equivalent to parse() on the YAML form of ``data``, without the YAML
+        round trip. ``data`` itself is left unmodified.
 
-        return VesperNode(**data)
+        Args:
+            data: Specification as nested dicts and lists
+
+        Returns:
+            Parsed VesperNode
+        """
+        return _build_node(copy.deepcopy(data))
 
     def validate(self, node: VesperNode) -> ValidationResult:
         """
@@ -117,7 +218,7 @@ class VesperCompiler:
         Returns:
             ValidationResult with any errors/warnings
         """
-        result = ValidationResult(valid=True)
+        result = ValidationResult.model_construct(valid=True)
 
         # Validate node_id format
         if not re.match(r"^[a-z_]+_v[0-9]+", node.node_id):
@@ -374,25 +475,7 @@ class VesperCompiler:
 
     def _translate_condition(self, condition: str) -> str:
         """Translate Vesper condition to Python."""
-        import re as regex
-
-        # Basic translations
-        result = condition
-
-        # Multi-word patterns first (before single-word replacements that might interfere)
-        result = regex.sub(
-            r"\bIS NOT NULL\b", "is not None", result, flags=regex.IGNORECASE
-        )
-        result = regex.sub(r"\bIS NULL\b", "is None", result, flags=regex.IGNORECASE)
-
-        # Single-word logical operators
-        result = regex.sub(r"\bAND\b", "and", result)
-        result = regex.sub(r"\bOR\b", "or", result)
-        result = regex.sub(r"\bNOT\b", "not", result)
-        result = regex.sub(r"\bIN\b", "in", result)
-        result = regex.sub(r"\bCONTAINS\b", "in", result)
-        result = result.replace("''", '""')
-        return result
+        return translate_condition(condition)
 
     def _generate_step(
         self, step: FlowStep, context_vars: set[str], indent: int = 1
@@ -15,14 +15,56 @@ This generator is designed to produce code that:
 from __future__ import annotations
 
 import re
+import string
 from datetime import datetime
 from pathlib import Path
 from typing import Any, NamedTuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
+from vesper.compiler import translate_condition
 from vesper.models import FlowStep, InputSpec, VesperNode
 
+_FORMATTER = string.Formatter()
+_IDENTIFIER = re.compile(r"\w+")
+_FSTRING_ESCAPES = str.maketrans(
+    {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "{": "{{", "}": "}}"}
+)
+
+
+def _template_to_fstring(template: str) -> str:
+    """
+    Compile a Vesper string template into the body of a Python f-string.
+
+    The template is tokenized once, at generation time, into literal and
+    field chunks, so the generated module concatenates them directly with no
+    format-string handling at call time. Literal text is escaped for the
+    f-string; ``{name}`` fields read from the step context, and conversions
+    and format specs are carried over.
+    """
+    try:
+        chunks = list(_FORMATTER.parse(template))
+    except ValueError:
+        # Unbalanced braces: keep the historical substitution behaviour
+        return re.sub(r"\{(\w+)\}", r"{context['\1']}", template)
+
+    parts: list[str] = []
+    for literal, field_name, format_spec, conversion in chunks:
+        parts.append(literal.translate(_FSTRING_ESCAPES))
+        if field_name is None:
+            continue
+        if _IDENTIFIER.fullmatch(field_name):
+            # Single quotes keep the dict key valid inside the f-string on 3.11
+            expr = f"context['{field_name}']"
+        else:
+            expr = field_name
+        if conversion:
+            expr += f"!{conversion}"
+        if format_spec:
+            expr += f":{format_spec}"
+        parts.append(f"{{{expr}}}")
+    return "".join(parts)
+
 
 class FieldSpec(NamedTuple):
     """Specification for a generated field."""
@@ -108,6 +150,10 @@ class VesperGenerator:
         self.env.filters["python_type"] = self._to_python_type
         self.env.filters["indent"] = self._indent
 
+        # Compiled on first use; reused so generate() skips the loader's
+        # up-to-date check on every call
+        self._function_template: Template | None = None
+
     def generate(self, node: VesperNode, source_file: str | None = None) -> str:
         """
         Generate Python code from a Vesper node.
@@ -119,7 +165,9 @@ class VesperGenerator:
         Returns:
             Generated Python code as a string
         """
-        template = self.env.get_template("function.py.jinja2")
+        if self._function_template is None:
+            self._function_template = self.env.get_template("function.py.jinja2")
+        template = self._function_template
 
         # Prepare template context
         context = self._build_context(node, source_file)
@@ -288,24 +336,7 @@ class VesperGenerator:
 
     def _translate_condition(self, condition: str) -> str:
         """Translate a Vesper condition to Python."""
-        result = condition
-
-        # Replace multi-word patterns first (before single-word replacements that might interfere)
-        result = re.sub(r"\bIS NOT NULL\b", "is not None", result, flags=re.IGNORECASE)
-        result = re.sub(r"\bIS NULL\b", "is None", result, flags=re.IGNORECASE)
-
-        # Replace logical operators
-        result = re.sub(r"\bAND\b", "and", result, flags=re.IGNORECASE)
-        result = re.sub(r"\bOR\b", "or", result, flags=re.IGNORECASE)
-        result = re.sub(r"\bNOT\b", "not", result, flags=re.IGNORECASE)
-
-        # Replace comparison operators
-        result = re.sub(r"\bIN\b", "in", result, flags=re.IGNORECASE)
-
-        # Replace string literals
-        result = result.replace("''", '""')
-
-        return result
+        return translate_condition(condition)
 
     def _replace_vars_with_context(self, expression: str) -> str:
         """Replace variable references with context lookups."""
@@ -508,12 +539,8 @@ class VesperGenerator:
         template = step.template or ""
         output_var = step.output or "result"
 
-        # Convert {var} to Python f-string format
-        # Use single quotes for dict keys to avoid quote conflicts in f-strings (Python 3.11 compatibility)
-        py_template = re.sub(r"\{(\w+)\}", r"{context['\1']}", template)
-
         return [
-            f'context["{output_var}"] = f"{py_template}"',
+            f'context["{output_var}"] = f"{_template_to_fstring(template)}"',
         ]
 
     def _generate_arithmetic_code(self, step: FlowStep) -> list[str]:
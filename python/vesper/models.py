@@ -338,11 +338,15 @@ class ValidationResult(BaseModel):
 
     def add_error(self, path: str, message: str) -> None:
         """Add an error to the validation result."""
-        self.errors.append(ValidationError(path=path, message=message))
+        # Issues are built from the compiler's own strings, so field
+        # validation is skipped
+        self.errors.append(ValidationError.model_construct(path=path, message=message))
         self.valid = False
 
     def add_warning(self, path: str, message: str) -> None:
         """Add a warning to the validation result."""
         self.warnings.append(
-            ValidationError(path=path, message=message, severity="warning")
+            ValidationError.model_construct(
+                path=path, message=message, severity="warning"
+            )
         )
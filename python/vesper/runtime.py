@@ -9,9 +9,10 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import importlib.util
+import math
 import random
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -20,6 +21,22 @@ from typing import Any
 from vesper.compiler import VesperCompiler
 from vesper.models import VesperNode
 
+# z-score for a 99.9% Wilson score confidence interval
+_Z_SCORE = 3.29
+
+
+def _wilson_lower_bound(n: int, divergences: int) -> float:
+    """Lower bound of the Wilson score interval for the non-divergent rate."""
+    z = _Z_SCORE
+    p = (n - divergences) / n
+
+    denominator = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denominator
+
+    margin = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+
+    return max(0, center - margin)
+
 
 class ExecutionMode(Enum):
     """Execution mode for dual-path routing."""
@@ -31,7 +48,7 @@ class ExecutionMode(Enum):
     DIRECT_ONLY = "direct_only"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionMetrics:
     """Metrics for a single execution."""
 
@@ -43,7 +60,7 @@ class ExecutionMetrics:
     divergence: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class RuntimeMetrics:
     """Accumulated metrics for a node."""
 
@@ -114,7 +131,11 @@ class MigrationController:
 
     def record_execution(self, metrics: ExecutionMetrics) -> None:
         """Record execution metrics."""
-        node_metrics = self.get_metrics(metrics.node_id)
+        # Inlined get_metrics: this runs on every dispatch
+        node_metrics = self._metrics.get(metrics.node_id)
+        if node_metrics is None:
+            node_metrics = RuntimeMetrics(node_id=metrics.node_id)
+            self._metrics[metrics.node_id] = node_metrics
         node_metrics.total_executions += 1
         node_metrics.total_duration_ms += metrics.duration_ms
 
@@ -140,21 +161,30 @@ class MigrationController:
         if metrics.total_executions < self.MIN_SAMPLE_SIZE:
             return 0.0
 
-        successes = metrics.total_executions - metrics.divergences
-
         # Wilson score with 99.9% confidence
-        z = 3.29  # z-score for 99.9% confidence
-        n = metrics.total_executions
-        p = successes / n
+        return _wilson_lower_bound(metrics.total_executions, metrics.divergences)
 
-        denominator = 1 + z**2 / n
-        center = (p + z**2 / (2 * n)) / denominator
+    def calculate_confidence_bulk(self, node_ids: Iterable[str]) -> list[float]:
+        """
+        Calculate confidence for many nodes at once.
+
+        Returns one value per node ID, in order, matching calculate_confidence.
+        Unknown nodes score 0.0 and, unlike get_metrics, are not registered.
+        """
+        min_samples = self.MIN_SAMPLE_SIZE
+        metrics_by_node = self._metrics
+        confidences: list[float] = []
+        append = confidences.append
 
-        import math
+        for node_id in node_ids:
+            metrics = metrics_by_node.get(node_id)
+            if metrics is None or metrics.total_executions < min_samples:
+                append(0.0)
+                continue
 
-        margin = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+            append(_wilson_lower_bound(metrics.total_executions, metrics.divergences))
 
-        return max(0, center - margin)  # Lower bound
+        return confidences
 
 
 class PythonExecutor:
@@ -15,10 +15,72 @@ This validator checks:
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
+from itertools import accumulate, repeat
+from pathlib import Path
 
+from vesper.compiler import VesperCompiler
 from vesper.models import FlowStep, InputSpec, VesperNode
 
+# Patterns and lookup tables used on every validate() call, built once at import
+_NODE_ID_PATTERN = re.compile(r"^[a-z][a-z0-9_]*_v[0-9]+[a-z0-9_]*$", re.IGNORECASE)
+_INPUT_NAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$", re.IGNORECASE)
+_CONDITION_VAR_PATTERN = re.compile(r"\b([a-z_][a-z0-9_]*)\b", re.IGNORECASE)
+_TEMPLATE_VAR_PATTERN = re.compile(r"\{(\w+)\}")
+_KNOWN_CONSTRAINT_PATTERN = re.compile(
+    "|".join(
+        (
+            r"^non_empty$",
+            r"^positive$",
+            r"^negative$",
+            r"^pattern:\s*.+",
+            r"^min:\s*\d+",
+            r"^max:\s*\d+",
+            r"^[<>=!]+\s*\d+",
+            r"^[<>=!]+\s*[\d.]+$",
+        )
+    ),
+    re.IGNORECASE,
+)
+
+_RESERVED_NAMES = frozenset(
+    {"import", "from", "class", "def", "return", "if", "else", "try"}
+)
+_CONDITION_KEYWORDS = frozenset(
+    {"and", "or", "not", "in", "is", "true", "false", "null", "none"}
+)
+_DANGEROUS_CAPABILITIES = frozenset(
+    {"filesystem.write", "exec.shell_command", "network.raw_socket"}
+)
+_EXTERNAL_OPERATIONS = frozenset(
+    {"external_api_call", "database_write", "database_update"}
+)
+
+# Nesting depth change for each parenthesis character
+_PAREN_STEP = {"(": 1, ")": -1}
+
+
+def _parens_balanced(text: str) -> bool:
+    """
+    Check every ``)`` closes an earlier ``(`` and none are left open.
+
+    The counts are compared first with str.count; the running depth is only
+    walked, via map/accumulate rather than a Python-level loop, when the
+    counts match and a closing parenthesis could come too early.
+    """
+    closing = text.count(")")
+    if text.count("(") != closing:
+        return False
+    if not closing:
+        return True
+    return min(accumulate(map(_PAREN_STEP.get, text, repeat(0)))) >= 0
+
+
+def _top_level_path(path: str) -> str:
+    """First component of an issue path, without any list index."""
+    return path.split(".", 1)[0].split("[", 1)[0]
+
 
 @dataclass
 class ValidationIssue:
@@ -28,6 +90,11 @@ class ValidationIssue:
     message: str
     severity: str  # "error", "warning", "info"
     suggestion: str | None = None
+    # Lowercased message for case-insensitive matching
+    message_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.message_lower = self.message.lower()
 
 
 @dataclass
@@ -36,6 +103,35 @@ class ValidationResult:
 
     valid: bool = True
     issues: list[ValidationIssue] = field(default_factory=list)
+    # Issues bucketed by top-level path component, and how many entries of
+    # issues the buckets cover
+    _by_path: defaultdict[str, list[ValidationIssue]] = field(
+        default_factory=lambda: defaultdict(list),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _indexed: int = field(default=0, init=False, repr=False, compare=False)
+
+    @property
+    def by_path(self) -> defaultdict[str, list[ValidationIssue]]:
+        """
+        Group issues by top-level path component.
+
+        ``flow[2].operation`` is grouped under ``flow``; unknown components
+        map to an empty list. Issues added since the last access are bucketed
+        on demand, so repeated lookups don't rescan the whole list.
+        """
+        issues = self.issues
+        buckets = self._by_path
+        if len(issues) < self._indexed:
+            # Issues were removed rather than appended; start over
+            buckets.clear()
+            self._indexed = 0
+        for issue in issues[self._indexed :]:
+            buckets[_top_level_path(issue.path)].append(issue)
+        self._indexed = len(issues)
+        return buckets
 
     @property
     def errors(self) -> list[ValidationIssue]:
@@ -111,34 +207,38 @@ class VesperValidator:
     """
 
     # Valid Vesper types
-    VALID_TYPES = {
-        "string",
-        "integer",
-        "decimal",
-        "boolean",
-        "bytes",
-        "timestamp",
-        "enum",
-        "any",
-    }
+    VALID_TYPES = frozenset(
+        {
+            "string",
+            "integer",
+            "decimal",
+            "boolean",
+            "bytes",
+            "timestamp",
+            "enum",
+            "any",
+        }
+    )
 
     # Valid operations
-    VALID_OPERATIONS = {
-        "validation",
-        "conditional",
-        "state_machine_transition",
-        "database_query",
-        "database_write",
-        "database_update",
-        "external_api_call",
-        "event_publish",
-        "event_subscribe",
-        "data_transform",
-        "string_template",
-        "arithmetic",
-        "return",
-        "call_node",
-    }
+    VALID_OPERATIONS = frozenset(
+        {
+            "validation",
+            "conditional",
+            "state_machine_transition",
+            "database_query",
+            "database_write",
+            "database_update",
+            "external_api_call",
+            "event_publish",
+            "event_subscribe",
+            "data_transform",
+            "string_template",
+            "arithmetic",
+            "return",
+            "call_node",
+        }
+    )
 
     def validate(self, node: VesperNode, strict: bool = False) -> ValidationResult:
         """
@@ -192,6 +292,26 @@ class VesperValidator:
 
         return result
 
+    def validate_source(
+        self, source: str | Path, strict: bool = False
+    ) -> ValidationResult:
+        """
+        Parse and validate a Vesper specification in one step.
+
+        Equivalent to ``validate(VesperCompiler().parse(source), strict)``.
+
+        Args:
+            source: Either a file path or YAML string
+            strict: If True, treat warnings as errors
+
+        Returns:
+            ValidationResult with all issues found
+
+        Raises:
+            ValueError: If parsing fails
+        """
+        return self.validate(VesperCompiler().parse(source), strict)
+
     def _validate_required_fields(
         self, node: VesperNode, result: ValidationResult
     ) -> None:
@@ -208,8 +328,7 @@ class VesperValidator:
             return
 
         # Check format: name_vN
-        pattern = r"^[a-z][a-z0-9_]*_v[0-9]+[a-z0-9_]*$"
-        if not re.match(pattern, node.node_id, re.IGNORECASE):
+        if not _NODE_ID_PATTERN.match(node.node_id):
             result.add_error(
                 "node_id",
                 f"Invalid node_id format: '{node.node_id}'. Expected format: name_vN (e.g., 'payment_handler_v1')",
@@ -217,11 +336,10 @@ class VesperValidator:
             )
 
         # Check for reserved words
-        reserved = {"import", "from", "class", "def", "return", "if", "else", "try"}
         base_name = (
             node.node_id.split("_v")[0] if "_v" in node.node_id else node.node_id
         )
-        if base_name in reserved:
+        if base_name in _RESERVED_NAMES:
             result.add_error(
                 "node_id",
                 f"Node ID base name '{base_name}' is a Python reserved word",
@@ -234,7 +352,7 @@ class VesperValidator:
             path = f"inputs.{name}"
 
             # Check name format
-            if not re.match(r"^[a-z_][a-z0-9_]*$", name, re.IGNORECASE):
+            if not _INPUT_NAME_PATTERN.match(name):
                 result.add_error(
                     path,
                     f"Invalid input name: '{name}'",
@@ -334,7 +452,7 @@ class VesperValidator:
             return issues
 
         # Check for balanced parentheses
-        if condition.count("(") != condition.count(")"):
+        if not _parens_balanced(condition):
             issues.append("Unbalanced parentheses")
 
         # Check for balanced quotes
@@ -345,12 +463,9 @@ class VesperValidator:
 
         # Extract variable references and check they exist
         # This is a simple heuristic - could be more sophisticated
-        var_pattern = r"\b([a-z_][a-z0-9_]*)\b"
-        keywords = {"and", "or", "not", "in", "is", "true", "false", "null", "none"}
-
-        for match in re.finditer(var_pattern, condition, re.IGNORECASE):
+        for match in _CONDITION_VAR_PATTERN.finditer(condition):
             var_name = match.group(1)
-            if var_name.lower() not in keywords:
+            if var_name.lower() not in _CONDITION_KEYWORDS:
                 # Check if it's a known input
                 if var_name not in node.inputs:
                     # Could be a dotted reference like user.id
@@ -441,14 +556,8 @@ class VesperValidator:
         security = node.security
 
         # Check for dangerous capabilities
-        dangerous = {
-            "filesystem.write",
-            "exec.shell_command",
-            "network.raw_socket",
-        }
-
         for cap in security.capabilities_required:
-            if cap in dangerous:
+            if cap in _DANGEROUS_CAPABILITIES:
                 result.add_warning(
                     "security.capabilities_required",
                     f"Capability '{cap}' is potentially dangerous",
@@ -466,10 +575,7 @@ class VesperValidator:
             )
 
         # Recommend audit for sensitive operations
-        has_external_calls = any(
-            s.operation in {"external_api_call", "database_write", "database_update"}
-            for s in node.flow
-        )
+        has_external_calls = any(s.operation in _EXTERNAL_OPERATIONS for s in node.flow)
         if has_external_calls and security.audit_level.value == "none":
             result.add_warning(
                 "security.audit_level",
@@ -511,7 +617,7 @@ class VesperValidator:
             expression = step.expression or ""
 
             for text in [template, expression]:
-                for match in re.finditer(r"\{(\w+)\}", text):
+                for match in _TEMPLATE_VAR_PATTERN.finditer(text):
                     var_name = match.group(1)
                     if var_name not in defined_vars:
                         result.add_warning(
@@ -588,20 +694,8 @@ class VesperValidator:
             return False
 
         # Known constraint patterns
-        known_patterns = [
-            r"^non_empty$",
-            r"^positive$",
-            r"^negative$",
-            r"^pattern:\s*.+",
-            r"^min:\s*\d+",
-            r"^max:\s*\d+",
-            r"^[<>=!]+\s*\d+",
-            r"^[<>=!]+\s*[\d.]+$",
-        ]
-
-        for pattern in known_patterns:
-            if re.match(pattern, constraint, re.IGNORECASE):
-                return True
+        if _KNOWN_CONSTRAINT_PATTERN.match(constraint):
+            return True
 
         # If it looks like an expression, it's probably valid
         if any(op in constraint for op in ["<", ">", "=", "!", "AND", "OR"]):
@@ -24,7 +24,7 @@ from vesper_verification.routing import ExecutionMode, RoutingDecision
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result from executing a semantic node."""
 
@@ -46,7 +46,7 @@ class ExecutionResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DualExecutionResult:
     """Result from executing both paths."""
 
@@ -70,18 +70,19 @@ class PythonRuntime:
     """Python-based reference runtime."""
 
     def __init__(self) -> None:
-        self._handlers: dict[str, Any] = {}
+        # node_id -> (handler, whether it is a coroutine function)
+        self._handlers: dict[str, tuple[Any, bool]] = {}
 
     def register_handler(self, node_id: str, handler: Any) -> None:
-        self._handlers[node_id] = handler
+        self._handlers[node_id] = (handler, inspect.iscoroutinefunction(handler))
 
     async def execute(self, node_id: str, inputs: dict[str, Any]) -> dict[str, Any]:
-        if node_id not in self._handlers:
+        entry = self._handlers.get(node_id)
+        if entry is None:
             raise RuntimeError(f"No handler registered for node: {node_id}")
 
-        handler = self._handlers[node_id]
-
-        if inspect.iscoroutinefunction(handler):
+        handler, is_async = entry
+        if is_async:
             result = await handler(**inputs)
         else:
             result = handler(**inputs)
@@ -96,18 +97,19 @@ class DirectRuntime:
     """Placeholder for the direct (optimized) runtime."""
 
     def __init__(self) -> None:
-        self._handlers: dict[str, Any] = {}
+        # node_id -> (handler, whether it is a coroutine function)
+        self._handlers: dict[str, tuple[Any, bool]] = {}
 
     def register_handler(self, node_id: str, handler: Any) -> None:
-        self._handlers[node_id] = handler
+        self._handlers[node_id] = (handler, inspect.iscoroutinefunction(handler))
 
     async def execute(self, node_id: str, inputs: dict[str, Any]) -> dict[str, Any]:
-        if node_id not in self._handlers:
+        entry = self._handlers.get(node_id)
+        if entry is None:
             raise RuntimeError(f"No handler registered for node: {node_id}")
 
-        handler = self._handlers[node_id]
-
-        if inspect.iscoroutinefunction(handler):
+        handler, is_async = entry
+        if is_async:
             result = await handler(**inputs)
         else:
             result = handler(**inputs)
@@ -8,14 +8,52 @@ safe migration decisions.
 
 from __future__ import annotations
 
+import bisect
+import json
 import math
 import time
 from dataclasses import dataclass, field
 
+try:
+    import orjson
 
-@dataclass
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Executions required before any non-zero confidence is reported
+MIN_SAMPLE_SIZE = 100
+
+# Upper confidence bounds (exclusive) for each recommended mode, in order
+_MODE_THRESHOLDS = (0.95, 0.999, 0.9999)
+_MODES = ("python_only", "canary_direct", "dual_verify", "direct_only")
+
+
+def _wilson_lower_bound(n: int, divergences: int, z: float, z2: float) -> float:
+    """
+    Lower bound of the Wilson score interval for n - divergences successes.
+
+    The textbook form in terms of p = successes / n, multiplied through by n
+    so it works on the integer counts directly:
+
+        (s + z²/2 - z·sqrt(s·d/n + z²/4)) / (n + z²)
+
+    with s successes and d divergences.
+    """
+    successes = n - divergences
+    margin = z * math.sqrt(successes * divergences / n + z2 * 0.25)
+    return max(0.0, (successes + z2 * 0.5 - margin) / (n + z2))
+
+
+@dataclass(slots=True)
 class RuntimeMetrics:
-    """Metrics for a node's execution history."""
+    """
+    Metrics for a node's execution history.
+
+    success_rate and divergence_rate are kept up to date by ConfidenceTracker
+    whenever it records executions; call refresh_rates() after changing the
+    counters directly.
+    """
 
     node_id: str
     total_executions: int = 0
@@ -23,20 +61,35 @@ class RuntimeMetrics:
     python_errors: int = 0
     direct_errors: int = 0
     last_updated: float = field(default_factory=time.time)
+    # (total_executions, divergences, confidence) from the last Wilson score
+    _cached_conf: tuple[int, int, float] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _success_rate: float = field(default=0.0, init=False, repr=False, compare=False)
+    _divergence_rate: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.refresh_rates()
+
+    def refresh_rates(self) -> None:
+        """Recompute the derived rates from the current counters."""
+        if self.total_executions == 0:
+            self._success_rate = 0.0
+            self._divergence_rate = 0.0
+        else:
+            total = self.total_executions
+            self._success_rate = (total - self.divergences) / total
+            self._divergence_rate = self.divergences / total
 
     @property
     def success_rate(self) -> float:
         """Rate of non-divergent executions."""
-        if self.total_executions == 0:
-            return 0.0
-        return (self.total_executions - self.divergences) / self.total_executions
+        return self._success_rate
 
     @property
     def divergence_rate(self) -> float:
         """Rate of divergent executions."""
-        if self.total_executions == 0:
-            return 0.0
-        return self.divergences / self.total_executions
+        return self._divergence_rate
 
 
 class ConfidenceTracker:
@@ -55,11 +108,14 @@ class ConfidenceTracker:
     - > 0.9999: DIRECT_ONLY (high confidence)
     """
 
-    MIN_SAMPLE_SIZE = 100
+    MIN_SAMPLE_SIZE = MIN_SAMPLE_SIZE
     Z_SCORE = 3.29
 
     def __init__(self) -> None:
         self.metrics: dict[str, RuntimeMetrics] = {}
+        # Derived per instance so a subclass overriding Z_SCORE is honoured
+        self._z = self.Z_SCORE
+        self._z_squared = self._z**2
 
     def record_execution(
         self,
@@ -69,11 +125,11 @@ class ConfidenceTracker:
         direct_error: bool = False,
     ) -> None:
         """Record an execution result."""
-        if node_id not in self.metrics:
-            self.metrics[node_id] = RuntimeMetrics(node_id=node_id)
+        m = self.metrics.get(node_id)
+        if m is None:
+            m = self.metrics[node_id] = RuntimeMetrics(node_id=node_id)
 
-        m = self.metrics[node_id]
-        m.total_executions += 1
+        total = m.total_executions = m.total_executions + 1
         if diverged:
             m.divergences += 1
         if python_error:
@@ -81,6 +137,58 @@ class ConfidenceTracker:
         if direct_error:
             m.direct_errors += 1
         m.last_updated = time.time()
+        # The cached confidence is keyed on the counters, so it goes stale on
+        # its own; only the rates need updating, inlined from refresh_rates.
+        m._success_rate = (total - m.divergences) / total
+        m._divergence_rate = m.divergences / total
+
+    def record_batch(
+        self,
+        node_id: str,
+        total: int,
+        divergences: int,
+        python_errors: int = 0,
+        direct_errors: int = 0,
+    ) -> None:
+        """
+        Record a batch of already-aggregated execution results.
+
+        Equivalent to calling record_execution ``total`` times, but updates
+        the counters in one step.
+
+        Raises:
+            ValueError: If a count is negative, or if divergences or either
+                error count exceeds ``total``
+        """
+        if min(total, divergences, python_errors, direct_errors) < 0:
+            raise ValueError(f"Batch counts for {node_id} must not be negative")
+        if max(divergences, python_errors, direct_errors) > total:
+            raise ValueError(
+                f"Batch for {node_id} has more divergences or errors than "
+                f"its {total} executions"
+            )
+        m = self.metrics.get(node_id)
+        if m is None:
+            m = self.metrics[node_id] = RuntimeMetrics(node_id=node_id)
+
+        m.total_executions += total
+        m.divergences += divergences
+        m.python_errors += python_errors
+        m.direct_errors += direct_errors
+        m.last_updated = time.time()
+        m._cached_conf = None
+        m.refresh_rates()
+
+    def record_pattern(self, node_id: str, n: int, div_every: int) -> None:
+        """
+        Record ``n`` executions where every ``div_every``-th one diverged.
+
+        Matches recording executions ``i in range(n)`` with
+        ``diverged=(i % div_every == 0)``. A ``div_every`` of 0 records no
+        divergences.
+        """
+        divergences = (n + div_every - 1) // div_every if div_every else 0
+        self.record_batch(node_id, total=n, divergences=divergences)
 
     def get_confidence(self, node_id: str) -> float:
         """
@@ -89,24 +197,20 @@ class ConfidenceTracker:
         Returns value between 0.0 and 1.0.
         Uses Wilson score confidence interval.
         """
-        if node_id not in self.metrics:
+        m = self.metrics.get(node_id)
+        if m is None:
             return 0.0
-
-        m = self.metrics[node_id]
-
-        if m.total_executions < self.MIN_SAMPLE_SIZE:
-            return 0.0
-
-        z = self.Z_SCORE
         n = m.total_executions
-        successes = n - m.divergences
-        p = successes / n
+        if n < self.MIN_SAMPLE_SIZE:
+            return 0.0
 
-        denominator = 1 + z**2 / n
-        center = (p + z**2 / (2 * n)) / denominator
-        margin = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+        cached = m._cached_conf
+        if cached is not None and cached[0] == n and cached[1] == m.divergences:
+            return cached[2]
 
-        return max(0.0, center - margin)
+        confidence = _wilson_lower_bound(n, m.divergences, self._z, self._z_squared)
+        m._cached_conf = (n, m.divergences, confidence)
+        return confidence
 
     def get_metrics(self, node_id: str) -> RuntimeMetrics | None:
         """Get raw metrics for a node."""
@@ -116,23 +220,43 @@ class ConfidenceTracker:
         """Get metrics for all tracked nodes."""
         return dict(self.metrics)
 
+    def all_confidences(self) -> dict[str, float]:
+        """
+        Calculate confidence for every tracked node in a single pass.
+
+        Equivalent to calling get_confidence per node, without the repeated
+        node lookups.
+        """
+        min_samples = self.MIN_SAMPLE_SIZE
+        z = self._z
+        z2 = self._z_squared
+        confidences: dict[str, float] = {}
+        for node_id, m in self.metrics.items():
+            n = m.total_executions
+            if n < min_samples:
+                confidences[node_id] = 0.0
+                continue
+            divergences = m.divergences
+            cached = m._cached_conf
+            if cached is None or cached[0] != n or cached[1] != divergences:
+                bound = _wilson_lower_bound(n, divergences, z, z2)
+                cached = m._cached_conf = (n, divergences, bound)
+            confidences[node_id] = cached[2]
+        return confidences
+
     def reset_metrics(self, node_id: str) -> None:
         """Reset metrics for a node."""
         if node_id in self.metrics:
             del self.metrics[node_id]
 
+    def clear(self) -> None:
+        """Reset metrics for every node."""
+        self.metrics.clear()
+
     def get_recommended_mode(self, node_id: str) -> str:
         """Get recommended execution mode based on confidence."""
         confidence = self.get_confidence(node_id)
-
-        if confidence < 0.95:
-            return "python_only"
-        elif confidence < 0.999:
-            return "canary_direct"
-        elif confidence < 0.9999:
-            return "dual_verify"
-        else:
-            return "direct_only"
+        return _MODES[bisect.bisect_right(_MODE_THRESHOLDS, confidence)]
 
     def serialize(self) -> dict:
         """Serialize tracker state for persistence."""
@@ -161,3 +285,34 @@ class ConfidenceTracker:
                 last_updated=values["last_updated"],
             )
         return tracker
+
+    def dumps(self) -> bytes:
+        """
+        Encode tracker state as compact JSON for checkpointing.
+
+        Each node is stored as a positional row in RuntimeMetrics field order
+        rather than a dict of named fields. Uses orjson when installed.
+        """
+        rows = [
+            (
+                m.node_id,
+                m.total_executions,
+                m.divergences,
+                m.python_errors,
+                m.direct_errors,
+                m.last_updated,
+            )
+            for m in self.metrics.values()
+        ]
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(rows)
+        return json.dumps(rows, separators=(",", ":")).encode()
+
+    @classmethod
+    def loads(cls, data: bytes | str) -> ConfidenceTracker:
+        """Restore tracker state produced by dumps."""
+        rows = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        tracker = cls()
+        for row in rows:
+            tracker.metrics[row[0]] = RuntimeMetrics(*row)
+        return tracker
@@ -10,6 +10,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import math
+import sys
 import uuid
 from collections.abc import Callable
 from dataclasses import dataclass, field
@@ -19,8 +20,40 @@ from typing import Any, Protocol
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Placeholder for a dict key present in only one of the compared outputs
+_MISSING = object()
+
+# Maximum number of joined diff paths cached per comparator
+_PATH_CACHE_SIZE = 1024
+
+# Maximum number of Decimal to float conversions cached per comparator
+_DECIMAL_CACHE_SIZE = 1024
+
+# Cumulative days before each month and days per month (index 0 unused,
+# February allowing 29), for converting ISO timestamps to epoch milliseconds
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_EPOCH_ORDINAL = 719163  # date(1970, 1, 1).toordinal()
+
+# Comparison strategies, selected by exact type when both sides match
+_DICT = "dict"
+_SEQUENCE = "sequence"
+_NUMBER = "number"
+_STRING = "string"
+_SCALAR = "scalar"
+_EXACT_KINDS: dict[type, str] = {
+    dict: _DICT,
+    list: _SEQUENCE,
+    tuple: _SEQUENCE,
+    float: _NUMBER,
+    Decimal: _NUMBER,
+    str: _STRING,
+    int: _SCALAR,
+    bool: _SCALAR,
+}
+
+
+@dataclass(slots=True)
 class Divergence:
     """Details about a divergence between two execution paths."""
 
@@ -32,6 +65,11 @@ class Divergence:
     timestamp: str
     trace_id: str
 
+    @property
+    def timestamp_ms(self) -> int:
+        """Detection time as whole milliseconds since the Unix epoch."""
+        return int(datetime.fromisoformat(self.timestamp).timestamp() * 1000)
+
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
         return {
@@ -65,6 +103,8 @@ class OutputComparator:
     ) -> None:
         self.epsilon = epsilon
         self.timestamp_tolerance_ms = timestamp_tolerance_ms
+        self._path_cache: dict[tuple[str | int, ...], str] = {}
+        self._decimal_cache: dict[Decimal, float] = {}
 
     def compare(
         self,
@@ -75,67 +115,167 @@ class OutputComparator:
         Compare two outputs for equality.
 
         Returns None if equal, dict describing differences if diverged.
-        """
-        differences = self._compare_recursive(python_output, direct_output, path="root")
 
-        if differences:
-            return {"differences": differences, "count": len(differences)}
-        return None
+        Nested structures are walked with an explicit stack rather than by
+        recursion. Paths are carried as tuples of components (dict keys as
+        str, list indices as int) and only joined into a string such as
+        ``root.items[1]`` when a difference is recorded.
+
+        Outputs that compare equal with ``==`` are reported equal without
+        being walked, so tolerance and type checks only run on a mismatch.
+        Values ``==`` already treats as equal (a str enum member and its
+        value, an OrderedDict and a dict) are not flagged as type mismatches.
+        """
+        if python_output == direct_output:
+            return None
 
-    def _compare_recursive(self, v1: Any, v2: Any, path: str) -> list[dict[str, Any]]:
-        """Recursively compare two values."""
+        # Allocated per call so one comparator can be shared across tasks
+        # and threads
         differences: list[dict[str, Any]] = []
+        stack: list[tuple[Any, Any, tuple[str | int, ...]]] = [
+            (python_output, direct_output, ("root",))
+        ]
 
-        if v1 is None and v2 is None:
-            return differences
-        if v1 is None or v2 is None:
-            differences.append(
-                {
-                    "path": path,
-                    "type": "null_mismatch",
-                    "python_value": v1,
-                    "direct_value": v2,
-                }
-            )
-            return differences
-
-        if not self._types_compatible(v1, v2):
-            differences.append(
-                {
-                    "path": path,
-                    "type": "type_mismatch",
-                    "python_type": type(v1).__name__,
-                    "direct_type": type(v2).__name__,
-                    "python_value": repr(v1),
-                    "direct_value": repr(v2),
-                }
-            )
-            return differences
+        # Bound methods hoisted out of the loop
+        pop = stack.pop
+        push = stack.append
+        push_all = stack.extend
+        kind_by_type = _EXACT_KINDS.get
 
-        if isinstance(v1, dict):
-            differences.extend(self._compare_dicts(v1, v2, path))
-        elif isinstance(v1, (list, tuple)):
-            differences.extend(self._compare_lists(v1, v2, path))
-        elif isinstance(v1, (float, Decimal)) or isinstance(v2, (float, Decimal)):
-            diff = self._compare_numbers(v1, v2, path)
-            if diff:
-                differences.append(diff)
-        elif isinstance(v1, str) and self._looks_like_timestamp(v1):
-            diff = self._compare_timestamps(v1, v2, path)
-            if diff:
-                differences.append(diff)
-        else:
-            if v1 != v2:
+        while stack:
+            v1, v2, parts = pop()
+
+            if v1 is v2:
+                continue
+
+            if v1 is _MISSING:
+                differences.append(
+                    {
+                        "path": self._make_path(parts),
+                        "type": "missing_in_python",
+                        "direct_value": v2,
+                    }
+                )
+                continue
+            if v2 is _MISSING:
                 differences.append(
                     {
-                        "path": path,
+                        "path": self._make_path(parts),
+                        "type": "missing_in_direct",
+                        "python_value": v1,
+                    }
+                )
+                continue
+
+            t1 = type(v1)
+            if t1 is type(v2):
+                kind = kind_by_type(t1)
+            elif v1 is None or v2 is None:
+                differences.append(
+                    {
+                        "path": self._make_path(parts),
+                        "type": "null_mismatch",
+                        "python_value": v1,
+                        "direct_value": v2,
+                    }
+                )
+                continue
+            elif not self._types_compatible(v1, v2):
+                differences.append(
+                    {
+                        "path": self._make_path(parts),
+                        "type": "type_mismatch",
+                        "python_type": t1.__name__,
+                        "direct_type": type(v2).__name__,
+                        "python_value": repr(v1),
+                        "direct_value": repr(v2),
+                    }
+                )
+                continue
+            else:
+                kind = None
+            if kind is None:
+                kind = self._kind_of(v1, v2)
+
+            if kind is _DICT:
+                # Identical children (shared objects, small ints, interned
+                # strings, None) can never diverge, so they are not queued
+                children = []
+                for key in set(v1) | set(v2):
+                    c1 = v1.get(key, _MISSING)
+                    c2 = v2.get(key, _MISSING)
+                    if c1 is not c2:
+                        children.append((c1, c2, (*parts, str(key))))
+                # Reversed so children pop in the same order they were listed
+                push_all(reversed(children))
+            elif kind is _SEQUENCE:
+                if len(v1) != len(v2):
+                    differences.append(
+                        {
+                            "path": self._make_path(parts),
+                            "type": "length_mismatch",
+                            "python_length": len(v1),
+                            "direct_length": len(v2),
+                        }
+                    )
+                for i in reversed(range(min(len(v1), len(v2)))):
+                    c1 = v1[i]
+                    c2 = v2[i]
+                    if c1 is not c2:
+                        push((c1, c2, (*parts, i)))
+            elif kind is _NUMBER:
+                diff = self._compare_numbers(v1, v2, parts)
+                if diff:
+                    differences.append(diff)
+            elif kind is _STRING and self._looks_like_timestamp(v1):
+                diff = self._compare_timestamps(v1, v2, parts)
+                if diff:
+                    differences.append(diff)
+            elif v1 != v2:
+                differences.append(
+                    {
+                        "path": self._make_path(parts),
                         "type": "value_mismatch",
                         "python_value": v1,
                         "direct_value": v2,
                     }
                 )
 
-        return differences
+        if not differences:
+            return None
+        return {"differences": differences, "count": len(differences)}
+
+    def _make_path(self, parts: tuple[str | int, ...]) -> str:
+        """
+        Join path components into ``root.key[index]`` form.
+
+        Outputs of one node share a schema, so the same paths recur across
+        comparisons; joined paths are interned and cached per component tuple.
+        """
+        path = self._path_cache.get(parts)
+        if path is not None:
+            return path
+        path = str(parts[0])
+        for part in parts[1:]:
+            path += f"[{part}]" if type(part) is int else f".{part}"
+        path = sys.intern(path)
+        if len(self._path_cache) >= _PATH_CACHE_SIZE:
+            self._path_cache.clear()
+        self._path_cache[parts] = path
+        return path
+
+    @staticmethod
+    def _kind_of(v1: Any, v2: Any) -> str:
+        """Classify a compatible pair whose exact type has no fast path."""
+        if isinstance(v1, dict):
+            return _DICT
+        if isinstance(v1, (list, tuple)):
+            return _SEQUENCE
+        if isinstance(v1, (float, Decimal)) or isinstance(v2, (float, Decimal)):
+            return _NUMBER
+        if isinstance(v1, str):
+            return _STRING
+        return _SCALAR
 
     def _types_compatible(self, v1: Any, v2: Any) -> bool:
         """Check if two types are compatible for comparison."""
@@ -148,65 +288,24 @@ class OutputComparator:
             return True
         return False
 
-    def _compare_dicts(self, d1: dict, d2: dict, path: str) -> list[dict[str, Any]]:
-        """Compare two dictionaries."""
-        differences: list[dict[str, Any]] = []
-        all_keys = set(d1.keys()) | set(d2.keys())
-
-        for key in all_keys:
-            key_path = f"{path}.{key}"
-            if key not in d1:
-                differences.append(
-                    {
-                        "path": key_path,
-                        "type": "missing_in_python",
-                        "direct_value": d2[key],
-                    }
-                )
-            elif key not in d2:
-                differences.append(
-                    {
-                        "path": key_path,
-                        "type": "missing_in_direct",
-                        "python_value": d1[key],
-                    }
-                )
-            else:
-                differences.extend(self._compare_recursive(d1[key], d2[key], key_path))
-        return differences
-
-    def _compare_lists(
-        self, l1: list | tuple, l2: list | tuple, path: str
-    ) -> list[dict[str, Any]]:
-        """Compare two lists/tuples."""
-        differences: list[dict[str, Any]] = []
-
-        if len(l1) != len(l2):
-            differences.append(
-                {
-                    "path": path,
-                    "type": "length_mismatch",
-                    "python_length": len(l1),
-                    "direct_length": len(l2),
-                }
-            )
-
-        for i in range(min(len(l1), len(l2))):
-            differences.extend(self._compare_recursive(l1[i], l2[i], f"{path}[{i}]"))
-        return differences
-
     def _compare_numbers(
-        self, n1: int | float | Decimal, n2: int | float | Decimal, path: str
+        self,
+        n1: int | float | Decimal,
+        n2: int | float | Decimal,
+        parts: tuple[str | int, ...],
     ) -> dict[str, Any] | None:
         """Compare two numbers with epsilon tolerance."""
-        f1 = float(n1)
-        f2 = float(n2)
+        f1 = self._decimal_to_float(n1) if type(n1) is Decimal else float(n1)
+        f2 = self._decimal_to_float(n2) if type(n2) is Decimal else float(n2)
 
-        if math.isnan(f1) and math.isnan(f2):
+        # NaN is the only float not equal to itself
+        nan1 = f1 != f1
+        nan2 = f2 != f2
+        if nan1 and nan2:
             return None
-        if math.isnan(f1) or math.isnan(f2):
+        if nan1 or nan2:
             return {
-                "path": path,
+                "path": self._make_path(parts),
                 "type": "nan_mismatch",
                 "python_value": n1,
                 "direct_value": n2,
@@ -216,46 +315,116 @@ class OutputComparator:
             if (f1 > 0) == (f2 > 0):
                 return None
             return {
-                "path": path,
+                "path": self._make_path(parts),
                 "type": "infinity_sign_mismatch",
                 "python_value": n1,
                 "direct_value": n2,
             }
 
-        if abs(f1 - f2) <= self.epsilon:
+        # Absolute epsilon below magnitude 1, relative epsilon above it
+        difference = abs(f1 - f2)
+        scale = max(1.0, abs(f1), abs(f2))
+        if difference <= self.epsilon * scale and scale != math.inf:
             return None
 
-        if abs(f1) > 1.0 or abs(f2) > 1.0:
-            relative_diff = abs(f1 - f2) / max(abs(f1), abs(f2))
-            if relative_diff <= self.epsilon:
-                return None
-
         return {
-            "path": path,
+            "path": self._make_path(parts),
             "type": "numeric_mismatch",
             "python_value": n1,
             "direct_value": n2,
-            "difference": abs(f1 - f2),
+            "difference": difference,
         }
 
+    def _decimal_to_float(self, d: Decimal) -> float:
+        """
+        Convert a Decimal to float, caching by value.
+
+        Money-like fields repeat the same few values across outputs. NaNs are
+        converted directly since signalling NaNs are not hashable.
+        """
+        if d.is_nan():
+            return float(d)
+        f = self._decimal_cache.get(d)
+        if f is None:
+            f = float(d)
+            if len(self._decimal_cache) >= _DECIMAL_CACHE_SIZE:
+                self._decimal_cache.clear()
+            self._decimal_cache[d] = f
+        return f
+
     def _looks_like_timestamp(self, s: str) -> bool:
         """Check if a string looks like a timestamp."""
         if len(s) >= 10 and s[4:5] == "-" and s[7:8] == "-":
             return True
         return False
 
-    def _compare_timestamps(self, t1: str, t2: str, path: str) -> dict[str, Any] | None:
+    @staticmethod
+    def _iso_to_ms(s: str) -> int | None:
+        """
+        Convert a ``YYYY-MM-DDTHH:MM:SSZ`` timestamp to epoch milliseconds.
+
+        Returns None for any other layout so the caller can fall back to
+        datetime.fromisoformat.
+        """
+        if (
+            len(s) != 20
+            or s[19] != "Z"
+            or s[4] != "-"
+            or s[7] != "-"
+            or s[10] != "T"
+            or s[13] != ":"
+            or s[16] != ":"
+        ):
+            return None
+        digits = s[0:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19]
+        if not (digits.isascii() and digits.isdigit()):
+            return None
+
+        year = int(s[0:4])
+        month = int(s[5:7])
+        day = int(s[8:10])
+        hour = int(s[11:13])
+        minute = int(s[14:16])
+        second = int(s[17:19])
+
+        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        if (
+            year < 1
+            or not 1 <= month <= 12
+            or not 1 <= day <= _DAYS_IN_MONTH[month]
+            or (month == 2 and day == 29 and not leap)
+            or hour > 23
+            or minute > 59
+            or second > 59
+        ):
+            return None
+
+        y = year - 1
+        days = y * 365 + y // 4 - y // 100 + y // 400 + _DAYS_BEFORE_MONTH[month] + day
+        if month > 2 and leap:
+            days += 1
+        days -= _EPOCH_ORDINAL
+        return ((days * 24 + hour) * 60 + minute) * 60000 + second * 1000
+
+    def _compare_timestamps(
+        self, t1: str, t2: str, parts: tuple[str | int, ...]
+    ) -> dict[str, Any] | None:
         """Compare two timestamps with tolerance."""
         try:
-            dt1 = datetime.fromisoformat(t1.replace("Z", "+00:00"))
-            dt2 = datetime.fromisoformat(t2.replace("Z", "+00:00"))
-            diff_ms = abs((dt1 - dt2).total_seconds() * 1000)
+            ms1 = self._iso_to_ms(t1)
+            ms2 = self._iso_to_ms(t2)
+            if ms1 is not None and ms2 is not None:
+                diff_ms = float(abs(ms1 - ms2))
+            else:
+                dt1 = datetime.fromisoformat(t1.replace("Z", "+00:00"))
+                dt2 = datetime.fromisoformat(t2.replace("Z", "+00:00"))
+                diff_ms = abs((dt1 - dt2).total_seconds() * 1000)
 
             if diff_ms <= self.timestamp_tolerance_ms:
                 return None
 
             return {
-                "path": path,
+                "path": self._make_path(parts),
                 "type": "timestamp_mismatch",
                 "python_value": t1,
                 "direct_value": t2,
@@ -264,7 +433,7 @@ class OutputComparator:
         except (ValueError, TypeError):
             if t1 != t2:
                 return {
-                    "path": path,
+                    "path": self._make_path(parts),
                     "type": "value_mismatch",
                     "python_value": t1,
                     "direct_value": t2,
@@ -280,7 +449,7 @@ class RuntimeProtocol(Protocol):
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffTestResult:
     """Result of a differential test."""
 
@@ -313,10 +482,16 @@ class DifferentialTester:
         python_runtime: RuntimeProtocol,
         direct_runtime: RuntimeProtocol,
         comparator: OutputComparator | None = None,
+        max_concurrency: int = 16,
     ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
         self.python_runtime = python_runtime
         self.direct_runtime = direct_runtime
         self.comparator = comparator or OutputComparator()
+        self.max_concurrency = max_concurrency
 
     async def test_node(
         self,
@@ -324,7 +499,13 @@ class DifferentialTester:
         test_inputs: list[dict[str, Any]],
         on_divergence: Callable[[Divergence], None] | None = None,
     ) -> DiffTestResult:
-        """Run differential tests on a node with provided inputs."""
+        """
+        Run differential tests on a node with provided inputs.
+
+        Up to ``max_concurrency`` inputs are executed at once. Outputs are
+        compared afterwards in input order, so divergences, errors and
+        callbacks are reported in the same order as ``test_inputs``.
+        """
         import time
 
         start_time = time.perf_counter()
@@ -336,12 +517,30 @@ class DifferentialTester:
             failed=0,
         )
 
-        for inputs in test_inputs:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def execute_both(
+            inputs: dict[str, Any],
+        ) -> tuple[dict[str, Any], dict[str, Any]] | Exception:
+            async with semaphore:
+                try:
+                    python_output, direct_output = await asyncio.gather(
+                        self.python_runtime.execute(node_id, inputs),
+                        self.direct_runtime.execute(node_id, inputs),
+                    )
+                except Exception as e:
+                    return e
+                return python_output, direct_output
+
+        outcomes = await asyncio.gather(
+            *(execute_both(inputs) for inputs in test_inputs)
+        )
+
+        for inputs, outcome in zip(test_inputs, outcomes, strict=True):
             try:
-                python_output, direct_output = await asyncio.gather(
-                    self.python_runtime.execute(node_id, inputs),
-                    self.direct_runtime.execute(node_id, inputs),
-                )
+                if isinstance(outcome, Exception):
+                    raise outcome
+                python_output, direct_output = outcome
 
                 diff = self.comparator.compare(python_output, direct_output)
 
@@ -6,8 +6,9 @@ from __future__ import annotations
 
 import statistics
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
+from itertools import islice
 from typing import Any
 
 
@@ -54,14 +55,26 @@ class AggregateMetrics:
 
 
 class MetricsCollector:
-    """Collect and aggregate execution metrics."""
+    """
+    Collect and aggregate execution metrics.
+
+    Counters are updated as executions are recorded. Each node keeps its most
+    recent MAX_EXECUTIONS_PER_NODE executions in a ring buffer, which latency
+    averages and percentiles are folded from when aggregates are requested.
+    """
 
     MAX_EXECUTIONS_PER_NODE = 10000
 
     def __init__(self) -> None:
-        self._executions: dict[str, list[ExecutionMetrics]] = defaultdict(list)
+        self._executions: dict[str, deque[ExecutionMetrics]] = defaultdict(
+            self._new_history
+        )
         self._aggregates: dict[str, AggregateMetrics] = {}
 
+    def _new_history(self) -> deque[ExecutionMetrics]:
+        """Ring buffer of recent executions for one node."""
+        return deque(maxlen=self.MAX_EXECUTIONS_PER_NODE)
+
     def record_execution(
         self,
         node_id: str,
@@ -82,20 +95,17 @@ class MetricsCollector:
             error_type=type(error).__name__ if error else None,
         )
 
-        executions = self._executions[node_id]
-        executions.append(metrics)
-
-        if len(executions) > self.MAX_EXECUTIONS_PER_NODE:
-            self._executions[node_id] = executions[-self.MAX_EXECUTIONS_PER_NODE :]
+        # Oldest executions fall off the ring buffer automatically
+        self._executions[node_id].append(metrics)
 
         self._update_aggregate(node_id, metrics)
 
     def _update_aggregate(self, node_id: str, metrics: ExecutionMetrics) -> None:
         """Update aggregate metrics with new execution."""
-        if node_id not in self._aggregates:
-            self._aggregates[node_id] = AggregateMetrics(node_id=node_id)
+        agg = self._aggregates.get(node_id)
+        if agg is None:
+            agg = self._aggregates[node_id] = AggregateMetrics(node_id=node_id)
 
-        agg = self._aggregates[node_id]
         agg.total_executions += 1
 
         if metrics.path == "python":
@@ -115,7 +125,7 @@ class MetricsCollector:
             return AggregateMetrics(node_id=node_id)
 
         agg = self._aggregates[node_id]
-        executions = self._executions.get(node_id, [])
+        executions = self._executions.get(node_id, ())
 
         if executions:
             python_durations = [e.duration_ms for e in executions if e.path == "python"]
@@ -145,8 +155,8 @@ class MetricsCollector:
         self, node_id: str, limit: int = 100
     ) -> list[ExecutionMetrics]:
         """Get recent executions for a node."""
-        executions = self._executions.get(node_id, [])
-        return list(reversed(executions[-limit:]))
+        executions = self._executions.get(node_id, ())
+        return list(islice(reversed(executions), limit))
 
     def export_prometheus_metrics(self) -> str:
         """Export metrics in Prometheus format."""
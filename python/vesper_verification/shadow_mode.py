@@ -5,12 +5,23 @@ Shadow Mode Execution for Vesper Verification
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import uuid
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Protocol
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 if TYPE_CHECKING:
     from vesper_verification.confidence import ConfidenceTracker
     from vesper_verification.differential import OutputComparator
@@ -19,6 +30,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Most shadow executions run concurrently, one per worker task
+SHADOW_MAX_WORKERS = 64
+
 
 class RuntimeProtocol(Protocol):
     """Protocol for runtime implementations."""
@@ -28,7 +42,7 @@ class RuntimeProtocol(Protocol):
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result from executing a semantic node."""
 
@@ -50,6 +64,18 @@ class ExecutionResult:
             "error": str(self.error) if self.error else None,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize to compact JSON, matching to_dict().
+
+        With orjson installed the dataclass is encoded directly, without
+        building the intermediate dict. Values JSON can't represent, such as
+        the error or Decimal outputs, are written as strings.
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.to_dict(), default=str, separators=(",", ":")).encode()
+
 
 class ShadowExecutor:
     """
@@ -60,6 +86,16 @@ class ShadowExecutor:
     - Direct runtime runs in background (async, doesn't block)
     - Divergences are logged but don't affect response
     - Collects data for confidence building
+
+    Submissions are queued and taken one at a time by a bounded pool of
+    worker tasks, so the caller only pays for a deque append rather than
+    creating a task, and a slow execution only holds up its own worker.
+
+    Output comparison runs on the event loop unless a ``compare_executor``
+    (e.g. a ThreadPoolExecutor) is given, for outputs large enough that
+    diffing them would stall other requests. The caller owns the executor;
+    the comparator can stay shared with inline callers such as the
+    orchestrator, since OutputComparator.compare keeps no per-call state.
     """
 
     def __init__(
@@ -69,13 +105,22 @@ class ShadowExecutor:
         confidence_tracker: ConfidenceTracker,
         metrics_collector: MetricsCollector | None = None,
         divergence_database: DivergenceDatabase | None = None,
+        compare_executor: Executor | None = None,
     ) -> None:
         self.direct_runtime = direct_runtime
         self.comparator = comparator
         self.confidence_tracker = confidence_tracker
         self.metrics_collector = metrics_collector
         self.divergence_database = divergence_database
-        self._pending_tasks: set[asyncio.Task] = set()
+        self.compare_executor = compare_executor
+        # Submitted executions not yet picked up by a worker
+        self._ring: deque[tuple[str, dict[str, Any], ExecutionResult]] = deque()
+        # Executions a worker has started and not yet finished
+        self._in_flight = 0
+        self._workers: set[asyncio.Task] = set()
+        # Resolved when the workers run out of work; created on demand in
+        # wait_for_pending so it always belongs to the running loop
+        self._drained: asyncio.Future[None] | None = None
 
     def execute_shadow(
         self,
@@ -84,11 +129,69 @@ class ShadowExecutor:
         python_result: ExecutionResult,
     ) -> None:
         """Launch shadow execution (non-blocking)."""
-        task = asyncio.create_task(
-            self._shadow_execution_task(node_id, inputs, python_result)
-        )
-        self._pending_tasks.add(task)
-        task.add_done_callback(self._pending_tasks.discard)
+        self._ring.append((node_id, inputs, python_result))
+        self._ensure_workers()
+
+    def execute_shadow_many(
+        self,
+        node_id: str,
+        inputs_list: Iterable[dict[str, Any]],
+        python_result: ExecutionResult,
+    ) -> None:
+        """
+        Launch one shadow execution per inputs dict (non-blocking).
+
+        Equivalent to calling execute_shadow for each entry.
+        """
+        self._ring.extend((node_id, inputs, python_result) for inputs in inputs_list)
+        self._ensure_workers()
+
+    def _ensure_workers(self) -> None:
+        """Start enough workers on the running loop to take the queued work."""
+        workers = self._workers
+        loop = asyncio.get_running_loop()
+        if workers and next(iter(workers)).get_loop() is not loop:
+            # Workers left behind on another loop will never run again
+            workers.clear()
+            self._in_flight = 0
+        idle = len(workers) - self._in_flight
+        needed = min(len(self._ring) - idle, SHADOW_MAX_WORKERS - len(workers))
+        for _ in range(needed):
+            workers.add(loop.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        """Take queued shadow executions one at a time until none are left."""
+        ring = self._ring
+        run = self._shadow_execution_task
+        workers = self._workers
+        this_task = asyncio.current_task()
+        try:
+            while ring:
+                node_id, inputs, python_result = ring.popleft()
+                self._in_flight += 1
+                try:
+                    await run(node_id, inputs, python_result)
+                except Exception as e:
+                    # Failures are handled per execution; one escaping must
+                    # not stop this worker from taking the rest of the queue
+                    logger.error(f"Shadow execution failed for {node_id}: {e}")
+                finally:
+                    # cancel_pending has already reset the count for a worker
+                    # it dropped
+                    if this_task in workers:
+                        self._in_flight -= 1
+        finally:
+            # Leave the pool as soon as the queue is empty, so a submission
+            # arriving now starts a fresh worker instead of counting on this one
+            workers.discard(this_task)
+        if not self._in_flight:
+            self._set_drained()
+
+    def _set_drained(self) -> None:
+        """Wake anyone waiting in wait_for_pending."""
+        drained = self._drained
+        if drained is not None and not drained.done():
+            drained.set_result(None)
 
     async def _shadow_execution_task(
         self,
@@ -114,7 +217,17 @@ class ShadowExecutor:
                 success=True,
             )
 
-            diff = self.comparator.compare(python_result.output, direct_result.output)
+            if self.compare_executor is None:
+                diff = self.comparator.compare(
+                    python_result.output, direct_result.output
+                )
+            else:
+                diff = await asyncio.get_running_loop().run_in_executor(
+                    self.compare_executor,
+                    self.comparator.compare,
+                    python_result.output,
+                    direct_result.output,
+                )
             diverged = diff is not None
 
             self.confidence_tracker.record_execution(
@@ -195,24 +308,45 @@ class ShadowExecutor:
 
     async def wait_for_pending(self, timeout: float | None = None) -> int:
         """Wait for all pending shadow executions to complete."""
-        if not self._pending_tasks:
+        pending_count = self.pending_count
+        if not pending_count:
             return 0
 
-        pending_count = len(self._pending_tasks)
+        loop = asyncio.get_running_loop()
+        drained = self._drained
+        if drained is None or drained.done() or drained.get_loop() is not loop:
+            drained = self._drained = loop.create_future()
 
         try:
-            await asyncio.wait_for(
-                asyncio.gather(*self._pending_tasks, return_exceptions=True),
-                timeout=timeout,
-            )
+            # Shielded so a timed-out waiter doesn't cancel it for the others
+            await asyncio.wait_for(asyncio.shield(drained), timeout=timeout)
         except TimeoutError:
-            logger.warning(
-                f"Timeout waiting for {len(self._pending_tasks)} shadow tasks"
-            )
+            logger.warning(f"Timeout waiting for {self.pending_count} shadow tasks")
 
         return pending_count
 
+    def swap_runtime(self, direct_runtime: RuntimeProtocol) -> None:
+        """
+        Replace the direct runtime used for shadow executions.
+
+        Executions that have already started keep the runtime they called;
+        queued ones use the new runtime.
+        """
+        self.direct_runtime = direct_runtime
+
+    def cancel_pending(self) -> int:
+        """Cancel all pending shadow executions, returning how many were pending."""
+        pending = self.pending_count
+        self._ring.clear()
+        workers = list(self._workers)
+        self._workers.clear()
+        for task in workers:
+            task.cancel()
+        self._in_flight = 0
+        self._set_drained()
+        return pending
+
     @property
     def pending_count(self) -> int:
         """Number of pending shadow executions."""
-        return len(self._pending_tasks)
+        return len(self._ring) + self._in_flight